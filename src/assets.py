@@ -0,0 +1,80 @@
+from pathlib import Path
+from typing import Callable
+
+import pygame
+
+import settings
+
+
+class AssetRegistry:
+    """Named sprites that are only decoded the first time they are drawn, then cached"""
+
+    # rotated copies are snapped to this many degrees, and at most this many are kept
+    ROTATION_STEP: float = 1.0
+    MAX_ROTATIONS: int = 1024
+
+    def __init__(self, path: Path):
+        self._path: Path = Path(path)
+        self._loaders: dict[str, Callable[["AssetRegistry"], pygame.Surface]] = {}
+        self._surfaces: dict[str, pygame.Surface] = {}
+        self._rotations: dict[tuple[str, int], pygame.Surface] = {}
+
+    def register(self, name: str, loader: Callable[["AssetRegistry"], pygame.Surface]) -> None:
+        assert name not in self._loaders, f"asset {name} is already registered"
+        self._loaders[name] = loader
+
+    def load(self, filename: str) -> pygame.Surface:
+        surface: pygame.Surface = pygame.image.load(self._path / filename)
+
+        # match the display's pixel format once there is one, so every blit skips the conversion
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+
+        return surface
+
+    def __getitem__(self, name: str) -> pygame.Surface:
+        surface: pygame.Surface | None = self._surfaces.get(name)
+        if surface is None:
+            surface = self._surfaces[name] = self._loaders[name](self)
+
+        return surface
+
+    def rotated(self, name: str, angle: float) -> pygame.Surface:
+        """The sprite rotated by angle degrees, rounded to the nearest ROTATION_STEP"""
+        key: tuple[str, int] = (name, round(angle / self.ROTATION_STEP))
+        surface: pygame.Surface | None = self._rotations.get(key)
+        if surface is None:
+            # oldest rotation goes first, a bird's angles never fill the cache on their own
+            if len(self._rotations) >= self.MAX_ROTATIONS:
+                del self._rotations[next(iter(self._rotations))]
+
+            surface = self._rotations[key] = pygame.transform.rotate(self[name], key[1] * self.ROTATION_STEP)
+
+        return surface
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._loaders
+
+    @property
+    def loaded(self) -> list[str]:
+        return list(self._surfaces)
+
+    def clear(self) -> None:
+        """Drops every decoded sprite, they are loaded again on their next draw"""
+        self._surfaces.clear()
+        self._rotations.clear()
+
+
+ASSETS: AssetRegistry = AssetRegistry(settings.ASSETS_PATH)
+
+# bird flapping animation, in the order the frames are played
+BIRD_FRAMES: tuple[str, ...] = ("bird-downflap", "bird-midflap", "bird-upflap")
+ASSETS.register("bird-downflap", lambda assets: assets.load("yellowbird-downflap.png"))
+ASSETS.register("bird-midflap", lambda assets: assets.load("yellowbird-midflap.png"))
+ASSETS.register("bird-upflap", lambda assets: assets.load("yellowbird-upflap.png"))
+
+ASSETS.register("pipe", lambda assets: assets.load("pipe-green.png"))
+ASSETS.register("pipe-reversed", lambda assets: pygame.transform.flip(assets["pipe"], False, True))
+ASSETS.register("base", lambda assets: assets.load("base.png"))
+ASSETS.register("background", lambda assets: pygame.transform.scale(
+    assets.load("background-day.png"), settings.SCREEN_SIZE))
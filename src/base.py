@@ -1,22 +1,23 @@
 
-import pygame
 import settings
+from assets import ASSETS
 from entity import Entity
+from render import Sprites
 
 
 class Base(Entity):
-    _IMG: pygame.Surface = pygame.image.load(settings.ASSETS_PATH / "base.png")
+    __slots__ = ()
 
     def __init__(self, x: float):
         super().__init__(x, settings.SCREEN_SIZE.y - settings.BASE_SIZE.y / 2,
                          settings.BASE_SIZE.x, settings.BASE_SIZE.y)
-        self._velocity = settings.BASE_VELOCITY
+        self._vx, self._vy = settings.BASE_VELOCITY
 
     def update(self, delta: float) -> None:
         super().update(delta)
 
-        if self._position.x + self._size.x <= 0:
-            self._position.x += settings.SCREEN_SIZE.x + self._size.x
+        if self._x + self._width <= 0:
+            self._x += settings.SCREEN_SIZE.x + self._width
 
-    def draw(self, display: pygame.Surface):
-        display.blit(Base._IMG, self._position)
+    def sprites(self) -> Sprites:
+        return [(ASSETS["base"], (self._x, self._y))]
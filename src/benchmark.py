@@ -0,0 +1,175 @@
+import importlib.metadata
+import json
+import platform
+import random
+import time
+from pathlib import Path
+
+import neat
+import neat.config
+import numpy as np
+import pygame
+
+import settings
+
+from bird import Bird
+from neat_game import NeatGame
+from profiler import FrameProfiler
+from speciation import VectorSpeciesSet
+from user_game import UserGame
+from vector_env import VectorEnv
+
+
+class FlockGame(UserGame):
+    """Headless UserGame with a scripted controller in place of the keyboard"""
+
+    def __init__(self, *, birds: int, seed: int, max_frames: int, jumps: bool, profiler: FrameProfiler):
+        self._bird_count: int = birds
+        self._max_frames: int = max_frames
+        self._jumps: bool = jumps
+        self._frame: int = 0
+
+        super(UserGame, self).__init__(headless=True, seed=seed, profiler=profiler)
+
+    def _gen_birds(self) -> list[Bird]:
+        return [Bird(
+            settings.SCREEN_SIZE.x / 2 - settings.BIRD_SIZE.x / 2,
+            settings.SCREEN_SIZE.y / 4 + settings.SCREEN_SIZE.y / 2 / self._bird_count * offset
+        ) for offset in range(self._bird_count)]
+
+    def _input(self) -> None:
+        self._frame += 1
+        if self._frame >= self._max_frames:
+            self._running = False
+
+        # every bird below the middle of the screen flaps
+        if self._jumps:
+            self._swarm.jump(self._swarm.y > settings.SCREEN_SIZE.y / 2)
+
+
+def bench_game(*, birds: int, seed: int, max_frames: int, jumps: bool) -> dict:
+    profiler: FrameProfiler = FrameProfiler()
+    game: FlockGame = FlockGame(birds=birds, seed=seed, max_frames=max_frames, jumps=jumps, profiler=profiler)
+
+    start: float = time.perf_counter()
+    game.run()
+    seconds: float = time.perf_counter() - start
+    totals: dict[str, float] = profiler.totals()
+
+    return {
+        "birds": birds,
+        "frames": totals["frames"],
+        "seconds": seconds,
+        "frames_per_second": totals["frames"] / seconds,
+        "phases": {phase: totals[phase] for phase in FrameProfiler.PHASES},
+    }
+
+
+def bench_neat(*, config: neat.config.Config, birds: int, seed: int, generations: int) -> dict:
+    config.pop_size = birds
+    random.seed(seed)
+
+    profiler: FrameProfiler = FrameProfiler()
+    game: NeatGame = NeatGame(headless=True, config=config, seed=seed, profiler=profiler)
+
+    start: float = time.perf_counter()
+    game.run(generations=generations)
+    seconds: float = time.perf_counter() - start
+    ran: int = len(profiler.runs)
+    totals: dict[str, float] = profiler.totals()
+
+    return {
+        "birds": birds,
+        "generations": ran,
+        "frames": totals["frames"],
+        "seconds": seconds,
+        "seconds_per_generation": seconds / ran,
+        "genomes_per_second": birds * ran / seconds,
+        "frames_per_second": totals["frames"] / seconds,
+        "phases": {phase: totals[phase] for phase in FrameProfiler.PHASES},
+        "per_generation": profiler.runs,
+    }
+
+
+def bench_vector(*, envs: int, seed: int, max_frames: int) -> dict:
+    env: VectorEnv = VectorEnv(envs, seed=seed)
+    observations: np.ndarray = env.reset()
+
+    start: float = time.perf_counter()
+    for _ in range(max_frames):
+        # every bird below the middle of its gap flaps
+        observations = env.step(observations[:, :, 1] + observations[:, :, 2] < 0)[0]
+    seconds: float = time.perf_counter() - start
+
+    return {
+        "birds": envs,
+        "frames": max_frames,
+        "seconds": seconds,
+        "frames_per_second": max_frames / seconds,
+        "game_frames_per_second": envs * max_frames / seconds,
+        "phases": {},
+    }
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure training throughput of the game loop and NEAT evaluation")
+    parser.add_argument("--populations", type=int, nargs="+", default=[50, 1_000, 10_000],
+                        help="number of birds or genomes to run each scenario with")
+    parser.add_argument("--scenarios", nargs="+", default=["fall", "flock", "neat"],
+                        choices=["fall", "flock", "neat", "vector"],
+                        help="fall: birds never jump, flock: scripted mass jumping, neat: NeatGame generations, "
+                             "vector: one scripted bird in each of that many VectorEnv games")
+    parser.add_argument("--generations", type=int, default=3,
+                        help="NEAT generations per population size")
+    parser.add_argument("--max-frames", type=int, default=3_000,
+                        help="frame budget for the fall, flock and vector scenarios")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for the pipe course and NEAT")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    config: neat.config.Config = neat.config.Config(
+        neat.DefaultGenome,
+        neat.DefaultReproduction,
+        VectorSpeciesSet,
+        neat.DefaultStagnation,
+        Path(__file__).parent.resolve() / "neat-config.cfg"
+    )
+
+    results: dict = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pygame": pygame.version.ver,
+        "neat": importlib.metadata.version("neat-python"),
+        "machine": platform.machine(),
+        "seed": args.seed,
+        "scenarios": {scenario: [] for scenario in args.scenarios},
+    }
+
+    for scenario in args.scenarios:
+        for birds in args.populations:
+            if scenario == "neat":
+                result: dict = bench_neat(config=config, birds=birds, seed=args.seed,
+                                          generations=args.generations)
+            elif scenario == "vector":
+                result: dict = bench_vector(envs=birds, seed=args.seed, max_frames=args.max_frames)
+            else:
+                result: dict = bench_game(birds=birds, seed=args.seed, max_frames=args.max_frames,
+                                          jumps=scenario == "flock")
+
+            results["scenarios"][scenario].append(result)
+
+            phases: str = ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in result["phases"].items())
+            print(f"{scenario:>6} {birds:>6} birds: {result['frames']:>6} frames in {result['seconds']:.3f}s "
+                  f"({result['frames_per_second']:.1f} FPS)" + (f" [{phases}]" if phases else ""))
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,28 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import pygame
 import math
 
 import settings
+from assets import ASSETS, BIRD_FRAMES
 from entity import Entity
+from render import Sprites
+
+if TYPE_CHECKING:
+    from swarm import BirdSwarm
 
 
 class Bird(Entity):
-    _BIRD_IMGS = [pygame.image.load(settings.ASSETS_PATH / filename) for filename in [
-        'yellowbird-downflap.png', 'yellowbird-midflap.png', 'yellowbird-upflap.png']]
+    __slots__ = ("_rotation", "_frame_counter", "_jump_counter", "_alive", "_index", "_swarm", "_slot")
+
     _bird_counter: int = 0
 
     def __init__(self, x: float, y: float):
         super().__init__(x, y, settings.BIRD_SIZE.x, settings.BIRD_SIZE.y)
         self._rotation: float = 0.0
-        self._velocity = settings.JUMP_VELOCITY.copy()
+        self._vx, self._vy = settings.JUMP_VELOCITY
 
         # counter for frame animations
         self._frame_counter: float = 0.0
@@ -26,8 +35,85 @@ class Bird(Entity):
         self._index: int = Bird._bird_counter
         Bird._bird_counter += 1
 
+        # batched state this bird is a view into, if any
+        self._swarm: BirdSwarm | None = None
+        self._slot: int = -1
+
+    def _attach(self, swarm: BirdSwarm, slot: int) -> None:
+        self._swarm = swarm
+        self._slot = slot
+
+    @property
+    def x(self) -> float:
+        if self._swarm is not None:
+            return float(self._swarm.x[self._slot])
+
+        return self._x
+
+    @x.setter
+    def x(self, x: float) -> None:
+        assert isinstance(x, float)
+        if self._swarm is not None:
+            self._swarm.x[self._slot] = x
+            return
+
+        self._x = x
+
+    @property
+    def y(self) -> float:
+        if self._swarm is not None:
+            return float(self._swarm.y[self._slot])
+
+        return self._y
+
+    @y.setter
+    def y(self, y: float) -> None:
+        assert isinstance(y, float)
+        if self._swarm is not None:
+            self._swarm.y[self._slot] = y
+            return
+
+        self._y = y
+
+    @property
+    def position(self) -> pygame.Vector2:
+        return pygame.Vector2(self.x, self.y)
+
+    @position.setter
+    def position(self, position: pygame.Vector2) -> None:
+        assert isinstance(position, pygame.Vector2)
+        if self._swarm is not None:
+            self._swarm.x[self._slot], self._swarm.y[self._slot] = position
+            return
+
+        self._x, self._y = position
+
+    @property
+    def velocity(self) -> pygame.Vector2:
+        if self._swarm is not None:
+            return pygame.Vector2(self._swarm.vx[self._slot], self._swarm.vy[self._slot])
+
+        return pygame.Vector2(self._vx, self._vy)
+
+    @velocity.setter
+    def velocity(self, velocity: pygame.Vector2) -> None:
+        assert isinstance(velocity, pygame.Vector2)
+        if self._swarm is not None:
+            self._swarm.vx[self._slot], self._swarm.vy[self._slot] = velocity
+            return
+
+        self._vx, self._vy = velocity
+
+    @property
+    def rect(self) -> pygame.Rect:
+        self._rect.update(self.x, self.y, self._width, self._height)
+        return self._rect
+
     @property
     def rotation(self) -> float:
+        if self._swarm is not None:
+            return float(self._swarm.rotation[self._slot])
+
         return self._rotation
 
     @property
@@ -36,54 +122,78 @@ class Bird(Entity):
 
     @property
     def is_alive(self) -> bool:
+        if self._swarm is not None:
+            return bool(self._swarm.alive[self._slot])
+
         return self._alive
 
     def kill(self) -> None:
+        if self._swarm is not None:
+            self._swarm.alive[self._slot] = False
+            return
+
         self._alive = False
 
     # Decorator method
     def check_alive(func):
         def wrapper(*args, **kwargs):
-            if args[0]._alive:
+            if args[0].is_alive:
                 return func(*args, **kwargs)
 
         return wrapper
 
     def _gravity(self, delta: float) -> None:
-        resulting_velocity: pygame.Vector2 = self._velocity + settings.GRAVITY * delta
+        vy: float = self._vy + settings.GRAVITY.y * delta
 
-        if resulting_velocity.y > settings.TERMINAL_VELOCITY.y:
-            self._velocity = settings.TERMINAL_VELOCITY
+        if vy > settings.TERMINAL_VELOCITY.y:
+            self._vx, self._vy = settings.TERMINAL_VELOCITY
             return
 
-        self._velocity = resulting_velocity
+        self._vx += settings.GRAVITY.x * delta
+        self._vy = vy
 
     @check_alive
     def update(self, delta: float) -> None:
         """Updates the birds position and rotation based on velocity"""
+        # attached birds are stepped in bulk by their swarm
+        if self._swarm is not None:
+            return
+
         super().update(delta)
 
         # Applies gravity to the bird
         self._gravity(delta)
 
         # sets the rotation of the bird to a proportion of its y velcity clamped to a [-90, 90] range
-        self._rotation = max(-90.0, min(-self._velocity.y / 3, 35.0))
+        self._rotation = max(-90.0, min(-self._vy / 3, 35.0))
         self._frame_counter += 5 * delta
         self._jump_counter += delta
 
     @check_alive
     def jump(self) -> None:
+        if self._swarm is not None:
+            swarm: BirdSwarm = self._swarm
+            if swarm.jump_counter[self._slot] < settings.JUMP_DELAY:
+                return
+
+            swarm.vx[self._slot], swarm.vy[self._slot] = settings.JUMP_VELOCITY
+            swarm.jump_counter[self._slot] = 0.0
+            return
+
         if self._jump_counter < settings.JUMP_DELAY:
             return
 
-        self._velocity = settings.JUMP_VELOCITY.copy()
+        self._vx, self._vy = settings.JUMP_VELOCITY
         self._jump_counter = 0.0
 
-    @check_alive
-    def draw(self, display: pygame.Surface) -> None:
-        # gets the correct bird flapping and rotates it according to its given rotation
-        rotated_img: pygame.image = pygame.transform.rotate(Bird._BIRD_IMGS[math.floor(
-            self._frame_counter % len(Bird._BIRD_IMGS))], self._rotation)
+    def sprites(self) -> Sprites:
+        if not self.is_alive:
+            return []
+
+        frame_counter: float = self._frame_counter
+        if self._swarm is not None:
+            frame_counter = float(self._swarm.frame_counter[self._slot])
 
-        # draw the bird image to the screen
-        display.blit(rotated_img, self._position)
+        # gets the correct bird flapping, pre-rotated to the nearest step of its given rotation
+        return [(ASSETS.rotated(BIRD_FRAMES[math.floor(frame_counter % len(BIRD_FRAMES))], self.rotation),
+                 (self.x, self.y))]
@@ -0,0 +1,148 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+import neat.config
+import neat.genome
+
+import settings
+
+from neat_game import NeatBird
+from network import CompiledNetworks
+
+# file layout: magic, header length, JSON header, then every array aligned to _ALIGNMENT bytes
+_MAGIC: bytes = b"FBNEAT\x00\x01"
+_LENGTH: struct.Struct = struct.Struct("<Q")
+_ALIGNMENT: int = 64
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+class ChampionGenome:
+    """Stands in for a genome when a NeatBird is rebuilt from a champion file, it only tracks fitness"""
+
+    def __init__(self, key: int, trained_fitness: float | None):
+        self.key: int = key
+        self.trained_fitness: float | None = trained_fitness
+        self.fitness: float = 0.0
+
+
+def save_champions(path: Path, genomes: list[neat.genome.DefaultGenome], config: neat.config.Config,
+                   metadata: list[dict] | None = None) -> None:
+    """Writes the flattened networks of the genomes, plus any extra metadata per genome, to one file"""
+    networks: CompiledNetworks = CompiledNetworks(genomes, config)
+    champions: list[dict] = [
+        {"key": genome.key, "fitness": genome.fitness, **(extra or {})}
+        for genome, extra in zip(genomes, metadata or [None] * len(genomes))]
+
+    # lay the arrays out after a header that records where each one starts
+    arrays: dict[str, np.ndarray] = {name: np.ascontiguousarray(array)
+                                     for name, array in networks.arrays().items()}
+    layout: dict[str, dict] = {}
+    offset: int = 0
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _align(offset + array.nbytes)
+
+    header: bytes = json.dumps({"network": networks.header, "champions": champions, "arrays": layout}).encode()
+    data_start: int = _align(len(_MAGIC) + _LENGTH.size + len(header))
+
+    # write next to the destination then rename over it so readers never see a partial file
+    path = Path(path)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(_MAGIC)
+            file.write(_LENGTH.pack(len(header)))
+            file.write(header)
+            for name, array in arrays.items():
+                file.seek(data_start + layout[name]["offset"])
+                file.write(array.tobytes())
+
+            file.truncate(data_start + offset)
+
+            # mkstemp creates the file readable by its owner only, give it the mode a plain open would
+            umask: int = os.umask(0)
+            os.umask(umask)
+            os.fchmod(file.fileno(), 0o666 & ~umask)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class ChampionBundle:
+    """Memory mapped champion file, its networks read their weights straight from the mapping"""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as file:
+            self._mmap: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(_MAGIC)] != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a champion file")
+
+        (header_length,) = _LENGTH.unpack_from(self._mmap, len(_MAGIC))
+        header_start: int = len(_MAGIC) + _LENGTH.size
+        header: dict = json.loads(self._mmap[header_start:header_start + header_length])
+        data_start: int = _align(header_start + header_length)
+
+        arrays: dict[str, np.ndarray] = {}
+        for name, entry in header["arrays"].items():
+            dtype: np.dtype = np.dtype(entry["dtype"])
+            count: int = int(np.prod(entry["shape"]))
+            if count == 0:
+                arrays[name] = np.empty(entry["shape"], dtype)
+                continue
+
+            arrays[name] = np.frombuffer(self._mmap, dtype, count, data_start + entry["offset"]) \
+                .reshape(entry["shape"])
+
+        self._champions: list[dict] = header["champions"]
+        self._networks: CompiledNetworks = CompiledNetworks.from_arrays(header["network"], arrays)
+
+    def __len__(self) -> int:
+        return len(self._champions)
+
+    @property
+    def champions(self) -> list[dict]:
+        return self._champions
+
+    @property
+    def networks(self) -> CompiledNetworks:
+        return self._networks
+
+    def bird(self, index: int = 0) -> NeatBird:
+        champion: dict = self._champions[index]
+
+        return NeatBird(
+            settings.SCREEN_SIZE.x / 2 - settings.BIRD_SIZE.x / 2,
+            settings.SCREEN_SIZE.y / 2,
+            ChampionGenome(champion["key"], champion["fitness"])
+        )
+
+    def birds(self) -> list[NeatBird]:
+        return [self.bird(index) for index in range(len(self))]
+
+    def close(self) -> None:
+        # the networks' arrays are views of the mapping, drop them before unmapping
+        self._networks = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # networks handed out are still alive, the mapping is released along with them
+            pass
+
+    def __enter__(self) -> "ChampionBundle":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
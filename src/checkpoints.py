@@ -0,0 +1,100 @@
+import copy
+import gzip
+import itertools
+import os
+import pickle
+import random
+import tempfile
+from pathlib import Path
+
+import neat
+import neat.config
+import neat.genome
+
+
+class AtomicCheckpointer(neat.Checkpointer):
+    """neat.Checkpointer that writes checkpoints atomically and restores everything needed to continue a run"""
+
+    _PREFIX: str = "neat-checkpoint-"
+
+    def __init__(self, directory: Path, *, generation_interval: int | None = 5,
+                 time_interval_seconds: float | None = 300, keep: int = 3):
+        self._directory: Path = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._keep: int = keep
+        self._best_genome: neat.genome.DefaultGenome | None = None
+
+        super().__init__(generation_interval, time_interval_seconds,
+                         str(self._directory / self._PREFIX))
+
+    def post_evaluate(self, config, population, species, best_genome) -> None:
+        # the population's best genome ever seen isn't handed to reporters, so track it here
+        if self._best_genome is None or best_genome.fitness > self._best_genome.fitness:
+            self._best_genome = best_genome
+
+    def save_checkpoint(self, config: neat.config.Config, population: dict, species_set, generation: int) -> None:
+        # checkpoints are taken after reproduction, so they hold the population of the next generation
+        next_generation: int = generation + 1
+        path: Path = self._directory / f"{self._PREFIX}{next_generation}"
+
+        # the species set holds on to the live reporters, which may own open files, they are reattached on restore
+        species_set = copy.copy(species_set)
+        species_set.reporters = None
+
+        data: tuple = (next_generation, config, population, species_set, random.getstate(),
+                       max(population) + 1, self._best_genome)
+
+        # write next to the destination then rename over it, so a crash never leaves a torn checkpoint
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self._directory, prefix=".tmp-")
+        try:
+            with os.fdopen(file_descriptor, "wb") as raw_file:
+                with gzip.GzipFile(fileobj=raw_file, mode="wb", compresslevel=5) as file:
+                    pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+                # mkstemp creates the file readable by its owner only, give it the mode a plain open would
+                umask: int = os.umask(0)
+                os.umask(umask)
+                os.fchmod(raw_file.fileno(), 0o666 & ~umask)
+
+                raw_file.flush()
+                os.fsync(raw_file.fileno())
+
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        self.__prune()
+
+    def __prune(self) -> None:
+        for path in self.checkpoints(self._directory)[:-self._keep]:
+            path.unlink()
+
+    @classmethod
+    def checkpoints(cls, directory: Path) -> list[Path]:
+        """Checkpoints in the directory, oldest first"""
+        paths: list[Path] = [path for path in Path(directory).glob(f"{cls._PREFIX}*")
+                             if path.name[len(cls._PREFIX):].isdigit()]
+
+        return sorted(paths, key=lambda path: int(path.name[len(cls._PREFIX):]))
+
+    @classmethod
+    def latest(cls, directory: Path) -> Path | None:
+        paths: list[Path] = cls.checkpoints(directory)
+        return paths[-1] if paths else None
+
+    @staticmethod
+    def restore_checkpoint(filename: Path) -> neat.Population:
+        """Resumes the simulation from a previous saved point"""
+        with gzip.open(filename) as file:
+            generation, config, population, species_set, random_state, next_key, best_genome = pickle.load(file)
+
+        random.setstate(random_state)
+
+        restored: neat.Population = neat.Population(config, (population, species_set, generation))
+        # keep new genome keys from colliding with the restored ones
+        restored.reproduction.genome_indexer = itertools.count(next_key)
+        restored.best_genome = best_genome
+        restored.species.reporters = restored.reporters
+
+        return restored
@@ -0,0 +1,55 @@
+import pygame
+
+import settings
+
+
+class SimulationClock:
+    """Fixed physics timestep kept separate from how often, and how fast, frames are drawn"""
+
+    def __init__(self, *, timestep: float = 1 / settings.FRAME_RATE, render_every_run: int = 1,
+                 render_every_frame: int = 1, max_speed: bool = False):
+        if timestep <= 0:
+            raise ValueError("Timestep must be a positive number")
+        if render_every_run <= 0 or render_every_frame <= 0:
+            raise ValueError("Render intervals must be positive numbers")
+
+        self._timestep: float = timestep
+        self._render_every_run: int = render_every_run
+        self._render_every_frame: int = render_every_frame
+        self._max_speed: bool = max_speed
+
+        # runs (NEAT generations) and frames stepped so far
+        self._run: int = -1
+        self._frame: int = 0
+
+    @property
+    def timestep(self) -> float:
+        return self._timestep
+
+    @property
+    def max_speed(self) -> bool:
+        return self._max_speed
+
+    @property
+    def run(self) -> int:
+        return self._run
+
+    @property
+    def frame(self) -> int:
+        return self._frame
+
+    @property
+    def renders(self) -> bool:
+        """Whether the current frame of the current run should be drawn"""
+        return self._run % self._render_every_run == 0 and self._frame % self._render_every_frame == 0
+
+    def start_run(self) -> None:
+        self._run += 1
+        self._frame = 0
+
+    def step(self) -> None:
+        self._frame += 1
+
+    def wait(self, clock: pygame.time.Clock) -> None:
+        # throttle drawn frames to real time unless running flat out, physics never depends on it
+        clock.tick(0 if self._max_speed else settings.FRAME_RATE)
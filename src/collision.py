@@ -0,0 +1,87 @@
+import numpy as np
+import pygame
+
+from entity import Entity
+from pipe import Pipes
+from swarm import BirdSwarm
+
+# (left, top, right, bottom) arrays of rects, broadcast against each other
+Edges = tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def rect_span(start, size) -> tuple[np.ndarray, np.ndarray]:
+    """Low and high edges of rects along one axis, truncated towards zero and normalised like pygame.Rect"""
+    low: np.ndarray = np.trunc(start)
+    high: np.ndarray = low + np.trunc(size)
+
+    # colliderect treats negative sizes as spanning back from the position
+    return np.minimum(low, high), np.maximum(low, high)
+
+
+def rect_edges(x, y, width, height) -> Edges:
+    """Edges of rects at x, y of the given sizes, see rect_span"""
+    left, right = rect_span(x, width)
+    top, bottom = rect_span(y, height)
+    return left, top, right, bottom
+
+
+def collides(a: Edges, b: Edges) -> np.ndarray:
+    """Whether rects a and b overlap like colliderect, a and b broadcast against each other"""
+    a_left, a_top, a_right, a_bottom = a
+    b_left, b_top, b_right, b_bottom = b
+
+    # colliderect never reports a hit for an empty rect, checked on each side before they are broadcast
+    return ((a_left < b_right) & (a_right > b_left) & (a_top < b_bottom) & (a_bottom > b_top) &
+            ((a_left != a_right) & (a_top != a_bottom)) & ((b_left != b_right) & (b_top != b_bottom)))
+
+
+def entity_edges(obstacles: list[Entity]) -> Edges:
+    """Edges of every rect of the obstacles in one row, the layout ObstaclePool.edges returns"""
+    rects: list[pygame.Rect] = []
+    for obstacle in obstacles:
+        if isinstance(obstacle, Pipes):
+            rects.append(obstacle.top_pipe.rect)
+            rects.append(obstacle.bottom_pipe.rect)
+        else:
+            rects.append(obstacle.rect)
+
+    return rect_edges(*(np.array([[getattr(rect, name) for rect in rects]], np.float64)
+                        for name in ("x", "y", "w", "h")))
+
+
+def kill_mask(swarm: BirdSwarm, obstacles: Edges) -> np.ndarray:
+    """Returns the birds that die this frame, matching Entity.collides and the ceiling check in Game.run.
+
+    obstacles holds the edges of every obstacle rect, one row per game and one column per rect. The swarm
+    holds the birds of every game side by side, the same number each.
+    """
+    # touching the top of the screen kills regardless of collisions
+    mask: np.ndarray = swarm.y <= 0
+    rect_left, rect_top, rect_right, rect_bottom = obstacles
+
+    games: int = len(rect_left)
+    if games > 1:
+        # every bird against the rects of its own game, one axis of rects after the birds, the dead ones
+        # too as most birds of many games are alive
+        shape: tuple[int, int, int] = (games, -1, 1)
+        birds: Edges = rect_edges(swarm.x.reshape(shape), swarm.y.reshape(shape), swarm.width.reshape(shape),
+                                  swarm.height.reshape(shape))
+        rects: Edges = (rect_left[:, np.newaxis], rect_top[:, np.newaxis], rect_right[:, np.newaxis],
+                        rect_bottom[:, np.newaxis])
+        mask |= collides(birds, rects).any(axis=2).reshape(-1) & swarm.alive
+        return mask
+
+    slots: np.ndarray = np.flatnonzero(swarm.alive)
+    if len(slots) == 0:
+        return mask
+
+    left, top, right, bottom = rect_edges(swarm.x[slots], swarm.y[slots], swarm.width[slots], swarm.height[slots])
+
+    # a single game's rects are shared by every bird, and only those level with some bird can be hit,
+    # normally the nearest pipe pair and one base
+    columns: np.ndarray = np.flatnonzero((rect_right[0] > left.min()) & (rect_left[0] < right.max()))
+    rects = (rect_left[0, columns], rect_top[0, columns], rect_right[0, columns], rect_bottom[0, columns])
+
+    birds = (left[:, np.newaxis], top[:, np.newaxis], right[:, np.newaxis], bottom[:, np.newaxis])
+    mask[slots[collides(birds, rects).any(axis=1)]] = True
+    return mask
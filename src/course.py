@@ -0,0 +1,49 @@
+import random
+
+import settings
+
+
+class Course:
+    """Reproducible sequence of pipe heights generated from a seed"""
+
+    # heights are drawn ahead of time in blocks of this size, small enough that short games stay cheap to start
+    _BLOCK_SIZE: int = 16
+
+    def __init__(self, seed: int | None = None):
+        # draw a fresh seed so even unseeded courses can be replayed
+        self._seed: int = random.getrandbits(32) if seed is None else seed
+        self._random: random.Random = random.Random(self._seed)
+        self._heights: list[float] = []
+
+        self.__extend(self._BLOCK_SIZE)
+
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    def __extend(self, length: int) -> None:
+        while len(self._heights) < length:
+            self._heights.extend(self._random.choice(settings.PIPE_HEIGHTS)
+                                 for _ in range(self._BLOCK_SIZE))
+
+    def height(self, index: int) -> float:
+        if index < 0:
+            raise IndexError("Pipe index must not be negative")
+
+        if index >= len(self._heights):
+            self.__extend(index + 1)
+
+        return self._heights[index]
+
+    def heights(self, length: int) -> list[float]:
+        self.__extend(length)
+        return self._heights[:length]
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Course) and self._seed == other._seed
+
+    def __hash__(self) -> int:
+        return hash(self._seed)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(seed={self._seed})"
@@ -4,75 +4,91 @@ from abc import ABC, abstractmethod
 
 import pygame
 
+from render import Sprites
+
 
 class Entity(ABC):
+    # plain float state updated in place, vectors and rects are only built on request
+    __slots__ = ("_x", "_y", "_width", "_height", "_vx", "_vy", "_rect")
 
     def __init__(self, x: float, y: float, width: float, height: float):
-        self._position: pygame.Vector2 = pygame.Vector2(x, y)
-        self._size: pygame.Vector2 = pygame.Vector2(width, height)
+        self._x: float = float(x)
+        self._y: float = float(y)
+        self._width: float = float(width)
+        self._height: float = float(height)
 
         # movement
-        self._velocity: pygame.Vector2 = pygame.Vector2(0.0, 0.0)
+        self._vx: float = 0.0
+        self._vy: float = 0.0
+
+        # reused by every rect lookup
+        self._rect: pygame.Rect = pygame.Rect(0, 0, 0, 0)
 
     @property
     def x(self) -> float:
-        return self._position.x
+        return self._x
 
     @x.setter
     def x(self, x: float) -> None:
         assert isinstance(x, float)
-        self._position = pygame.Vector2(x, self._position.y)
+        self._x = x
 
     @property
     def y(self) -> float:
-        return self._position.y
+        return self._y
 
     @y.setter
     def y(self, y: float) -> None:
         assert isinstance(y, float)
-        self._position = pygame.Vector2(self._position.x, y)
+        self._y = y
 
     @property
     def position(self) -> pygame.Vector2:
-        return self._position.copy()
+        return pygame.Vector2(self._x, self._y)
 
     @position.setter
     def position(self, position: pygame.Vector2) -> None:
         assert isinstance(position, pygame.Vector2)
-        self._position = position
+        self._x, self._y = position
 
     @property
     def width(self) -> float:
-        return self._size.x
+        return self._width
 
     @property
     def height(self) -> float:
-        return self._size.y
+        return self._height
 
     @property
     def size(self) -> pygame.Vector2:
-        return self._size.copy()
+        return pygame.Vector2(self._width, self._height)
 
     @property
     def velocity(self) -> pygame.Vector2:
-        return self._velocity
+        return pygame.Vector2(self._vx, self._vy)
 
     @velocity.setter
     def velocity(self, velocity: pygame.Vector2) -> None:
         assert isinstance(velocity, pygame.Vector2)
-        self._velocity = velocity
+        self._vx, self._vy = velocity
 
     @property
     def rect(self) -> pygame.Rect:
-        return pygame.Rect(self._position, self._size)
+        # the cached rect is refreshed in place, copy it to keep a snapshot
+        self._rect.update(self._x, self._y, self._width, self._height)
+        return self._rect
 
     def collides(self, other: Entity) -> bool:
         assert isinstance(other, Entity), "other must be of type object Entity"
         return self.rect.colliderect(other.rect)
 
     def update(self, delta: float) -> None:
-        self._position += self._velocity * delta
+        self._x += self._vx * delta
+        self._y += self._vy * delta
 
     @abstractmethod
-    def draw(self, display: pygame.Surface) -> None:
+    def sprites(self) -> Sprites:
         pass
+
+    def draw(self, display: pygame.Surface) -> None:
+        display.blits(self.sprites(), doreturn=False)
@@ -0,0 +1,93 @@
+import os
+import struct
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# file layout: magic, a fixed header, then one jump bit per frame
+_MAGIC: bytes = b"FBEPIS\x00\x01"
+_HEADER: struct.Struct = struct.Struct("<qd4dqdd")
+
+
+class Episode:
+    """One bird's run through a course: where it started, every frame's jump decision and how it scored.
+
+    The course is rebuilt from its seed, so replaying the jumps reproduces the run without its network.
+    """
+
+    __slots__ = ("_seed", "_timestep", "_start", "_jumps", "_fitness", "_cap")
+
+    def __init__(self, *, seed: int, timestep: float, start: tuple[float, float, float, float], jumps: np.ndarray,
+                 fitness: float, cap: float | None):
+        self._seed: int = seed
+        self._timestep: float = timestep
+        # x, y, x velocity and y velocity of the bird on the first frame
+        self._start: tuple[float, float, float, float] = start
+        self._jumps: np.ndarray = np.asarray(jumps, np.bool_)
+        self._fitness: float = fitness
+        self._cap: float | None = cap
+
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    @property
+    def timestep(self) -> float:
+        return self._timestep
+
+    @property
+    def start(self) -> tuple[float, float, float, float]:
+        return self._start
+
+    @property
+    def jumps(self) -> np.ndarray:
+        return self._jumps
+
+    @property
+    def frames(self) -> int:
+        return len(self._jumps)
+
+    @property
+    def fitness(self) -> float:
+        return self._fitness
+
+    @property
+    def cap(self) -> float | None:
+        return self._cap
+
+    def save(self, path: Path) -> None:
+        header: bytes = _HEADER.pack(self._seed, self._timestep, *self._start, self.frames, self._fitness,
+                                     float("nan") if self._cap is None else self._cap)
+
+        # write next to the destination then rename over it so readers never see a partial file
+        path = Path(path)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(_MAGIC)
+                file.write(header)
+                file.write(np.packbits(self._jumps).tobytes())
+
+                # mkstemp creates the file readable by its owner only, give it the mode a plain open would
+                umask: int = os.umask(0)
+                os.umask(umask)
+                os.fchmod(file.fileno(), 0o666 & ~umask)
+
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: Path) -> "Episode":
+        data: bytes = Path(path).read_bytes()
+        if data[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"{path} is not an episode file")
+
+        seed, timestep, x, y, vx, vy, frames, fitness, cap = _HEADER.unpack_from(data, len(_MAGIC))
+        jumps: np.ndarray = np.unpackbits(
+            np.frombuffer(data, np.uint8, offset=len(_MAGIC) + _HEADER.size), count=frames).astype(np.bool_)
+
+        return cls(seed=seed, timestep=timestep, start=(x, y, vx, vy), jumps=jumps, fitness=fitness,
+                   cap=None if np.isnan(cap) else cap)
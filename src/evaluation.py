@@ -0,0 +1,170 @@
+import hashlib
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+
+import neat.config
+import neat.genome
+
+import settings
+
+from parallel import ShardEvaluator, simulate_shard
+from policy import EvaluationPolicy
+
+# fitness over every course a genome was scored on
+_AGGREGATES: dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "mean": lambda fitness: fitness.mean(axis=0),
+    "min": lambda fitness: fitness.min(axis=0),
+}
+
+
+def genome_hash(genome: neat.genome.DefaultGenome) -> bytes:
+    """Digest of everything that decides how a genome flies, genomes with the same structure share it"""
+    digest = hashlib.blake2b(digest_size=16)
+    for key in sorted(genome.nodes):
+        node = genome.nodes[key]
+        digest.update(repr((key, node.bias, node.response, node.activation, node.aggregation)).encode())
+
+    # disabled connections don't change how it flies, hashing them anyway only risks a needless simulation
+    for key in sorted(genome.connections):
+        connection = genome.connections[key]
+        digest.update(repr((key, connection.weight, connection.enabled)).encode())
+
+    return digest.digest()
+
+
+class FitnessCache:
+    """Least recently used fitness of genome structures on single courses"""
+
+    def __init__(self, max_size: int):
+        if max_size < 0:
+            raise ValueError("Cache size can't be negative")
+
+        self._max_size: int = max_size
+        self._entries: OrderedDict[tuple[bytes, int], float] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    def get(self, structure: bytes, seed: int) -> float | None:
+        fitness: float | None = self._entries.get((structure, seed))
+        if fitness is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end((structure, seed))
+        return fitness
+
+    def put(self, structure: bytes, seed: int, fitness: float) -> None:
+        if self._max_size == 0:
+            return
+
+        self._entries[(structure, seed)] = fitness
+        self._entries.move_to_end((structure, seed))
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+
+class MultiCourseEvaluator:
+    """Scores every genome on the same few seeded courses and aggregates them into one fitness.
+
+    Results are cached per genome structure and course, so elites carried over unchanged and
+    identical offspring are never simulated again.
+    """
+
+    def __init__(self, courses: int, *, seed: int | None = None, aggregate: str = "mean", cache_size: int = 10_000,
+                 workers: int = 1, policy: EvaluationPolicy | None = None, skip_frames: bool = False):
+        if courses <= 0:
+            raise ValueError("Courses must be a positive number")
+        if aggregate not in _AGGREGATES:
+            raise ValueError(f"Unknown aggregate: {aggregate}, expected one of {', '.join(_AGGREGATES)}")
+        if policy is not None and policy.stop_when_decided:
+            raise ValueError("Cached fitness can't depend on the rest of the generation, don't stop when decided")
+
+        # the same courses every generation, otherwise nothing could be reused
+        base: int = settings.COURSE_SEED if seed is None else seed
+        self._seeds: list[int] = [base + index for index in range(courses)]
+        self._aggregate: str = aggregate
+        self._cache: FitnessCache = FitnessCache(cache_size)
+        self._policy: EvaluationPolicy | None = policy
+        self._skip_frames: bool = skip_frames
+        self._frames: int = 0
+
+        # spread the simulations over worker processes, or run them in this one
+        self._shards: ShardEvaluator | None = ShardEvaluator(
+            workers, policy=policy, skip_frames=skip_frames) if workers > 1 else None
+
+    @property
+    def seeds(self) -> list[int]:
+        return self._seeds
+
+    @property
+    def cache(self) -> FitnessCache:
+        return self._cache
+
+    @property
+    def frames(self) -> int:
+        """Frames simulated for the last evaluation, cached results cost none"""
+        return self._frames
+
+    def evaluate(self, genomes: list[tuple[int, neat.genome.DefaultGenome]], config: neat.config.Config) -> None:
+        population: list[neat.genome.DefaultGenome] = [genome for _, genome in genomes]
+        structures: list[bytes] = [genome_hash(genome) for genome in population]
+
+        # look everything up first, then simulate only what's missing, identical genomes only once
+        known: dict[tuple[bytes, int], float] = {}
+        batches: list[tuple[int, dict[bytes, neat.genome.DefaultGenome]]] = []
+        for seed in self._seeds:
+            pending: dict[bytes, neat.genome.DefaultGenome] = {}
+            for structure, genome in zip(structures, population):
+                if (structure, seed) in known or structure in pending:
+                    continue
+
+                cached: float | None = self._cache.get(structure, seed)
+                if cached is None:
+                    pending[structure] = genome
+                else:
+                    known[(structure, seed)] = cached
+
+            batches.append((seed, pending))
+
+        results: list[list[float]] = self.__simulate(
+            [(seed, list(pending.values())) for seed, pending in batches], config)
+        for (seed, pending), fitnesses in zip(batches, results):
+            for structure, fitness in zip(pending, fitnesses):
+                known[(structure, seed)] = fitness
+                self._cache.put(structure, seed, fitness)
+
+        courses: np.ndarray = np.array(
+            [[known[(structure, seed)] for structure in structures] for seed in self._seeds])
+        for genome, fitness in zip(population, _AGGREGATES[self._aggregate](courses).tolist()):
+            genome.fitness = fitness
+
+    def __simulate(self, batches: list[tuple[int, list[neat.genome.DefaultGenome]]],
+                   config: neat.config.Config) -> list[list[float]]:
+        if self._shards is not None:
+            fitnesses: list[list[float]] = self._shards.simulate(batches, config)
+            self._frames = self._shards.frames
+            return fitnesses
+
+        fitnesses = []
+        self._frames = 0
+        for seed, population in batches:
+            result, frames = simulate_shard(
+                population, config, seed, self._policy, self._skip_frames) if population else ([], 0)
+            fitnesses.append(result)
+            self._frames += frames
+
+        return fitnesses
+
+    def close(self) -> None:
+        if self._shards is not None:
+            self._shards.close()
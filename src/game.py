@@ -1,36 +1,65 @@
 import abc
+import time
+
 import pygame
 
+import collision
 import settings
 
-from entity import Entity
+from assets import ASSETS
 from bird import Bird
-from pipe import Pipes
-from base import Base
+from clock import SimulationClock
+from course import Course
+from obstacles import ObstaclePool
+from profiler import FrameProfiler
+from render import Renderer
+from swarm import BirdSwarm
 
 
 class Game(abc.ABC):
-    # background image
-    _BACKGROUND_IMG: pygame.image = pygame.transform.scale(pygame.image.load(
-        settings.ASSETS_PATH / "background-day.png"), settings.SCREEN_SIZE)
+    def __init__(self, *, headless: bool, seed: int | None = None, clock: SimulationClock | None = None,
+                 profiler: FrameProfiler | None = None):
+        # opt in per phase timing of every frame
+        self._profiler: FrameProfiler | None = profiler
 
-    def __init__(self, *, headless: bool):
-        # Logic for the game loop
+        # Logic for the game loop, physics always advance by the same fixed timestep
+        self._simulation_clock: SimulationClock = clock if clock is not None else SimulationClock()
         self._running: bool = True
-        self._dt: float = 1 / settings.FRAME_RATE
+        self._dt: float = self._simulation_clock.timestep
         self._headless: bool = headless
 
+        # a fixed seed replays the same pipe course every run, otherwise each run draws its own
+        self._seed: int | None = seed
+        self._course: Course | None = Course(seed) if seed is not None else None
+
+    @property
+    def course(self) -> Course | None:
+        return self._course
+
+    @property
+    def obstacles(self) -> ObstaclePool:
+        return self._obstacles
+
     def __gen_game_objects(self) -> None:
+        # Every run without a fixed seed gets a fresh course
+        if self._seed is None:
+            self._course = Course()
+
         # Create game objects
         self._birds: list[Bird] = self._gen_birds()
+        self._swarm: BirdSwarm = BirdSwarm(self._birds)
 
-        self._pipes: list[Pipes] = [
-            Pipes(settings.PIPE_INITIAL_X), Pipes(settings.PIPE_INITIAL_X * 2)]
-        self._bases: list[Base] = [Base(x) for x in range(-10, 336 * 4, 336)]
+        # pipes and ground live in a fixed pool of slots, recycled in place as they scroll by
+        self._obstacles: ObstaclePool = ObstaclePool([self._course])
+
+    @property
+    def frames(self) -> int:
+        """Frames simulated in the current, or last, run"""
+        return self._simulation_clock.frame
 
     @property
     def birds_alive(self) -> int:
-        return sum(1 for bird in self._birds if bird.is_alive)
+        return self._swarm.alive_count
 
     @abc.abstractmethod
     def _gen_birds(self) -> list[Bird]:
@@ -48,66 +77,115 @@ class Game(abc.ABC):
             settings.SCREEN_SIZE)
         self._clock: pygame.time.Clock = pygame.time.Clock()
         self._font = pygame.font.Font("freesansbold.ttf", 32)
-
-        self._dt = 0
+        self._renderer: Renderer = Renderer(self._screen, ASSETS["background"], self._font)
 
     @abc.abstractmethod
-    def _display_text(self) -> None:
+    def _display_text(self) -> list[str]:
+        """Lines of the HUD drawn in the top left corner"""
         pass
 
-    def __get_entities(self) -> list[Entity]:
-        return [*self._pipes, *self._bases, *self._birds]
+    def _update(self, render: bool) -> None:
+        # Scroll every pipe and piece of ground at once and draw them
+        self._obstacles.update(self._dt)
 
-    def run(self) -> None:
-        # Create all the objects required for the game
-        self.__gen_game_objects()
-        self._running = True
+        # Step every bird at once, birds are only views for drawing
+        self._swarm.update(self._dt)
 
-        while self._running:
-            if not self._headless:
-                # fill the screen with a color to wipe away anything from last frame
-                pygame.Surface.blit(
-                    self._screen, Game._BACKGROUND_IMG, (0, 0))
+        if render:
+            self._renderer.draw(self._obstacles.sprites())
 
-            # Checks to see if the birds still exist
-            if self.birds_alive == 0:
-                self._running = False
+            # the birds share a column, so one box around them all is cheaper to update than each bird
+            self._renderer.draw(self._swarm.sprites(), merge=True)
 
-            # Update all entity positions and draw them
-            for entity in self.__get_entities():
-                entity.update(self._dt)
+    def _recycle_pipes(self) -> None:
+        # Accelerate the pipes and loop them back to the beginning in place
+        self._obstacles.recycle()
 
-                if not self._headless:
-                    entity.draw(self._screen)
+    def _collide(self) -> None:
+        # Kill every bird touching the ground, a pipe or the ceiling in one pass
+        self._swarm.kill(collision.kill_mask(self._swarm, self._obstacles.edges()))
 
-            # Loop pipes back to the beginning
-            for pipe in self._pipes.copy():
-                # Accelerate the pipes
-                pipe.velocity += settings.PIPE_ACCELERATION
+    def __present(self, render: bool) -> None:
+        # Draw things to the screen
+        if render:
+            self._renderer.text(self._display_text())
 
-                if pipe.x + pipe.width <= 0:
-                    self._pipes.remove(pipe)
-                    self._pipes.append(
-                        Pipes(settings.PIPE_INITIAL_X * (len(self._pipes) + 1)))
-                    self._pipes[-1].velocity = pipe.velocity
+            # put only what changed since the last drawn frame on screen
+            self._renderer.present()
 
-            for object in [*self._bases, *self._pipes]:
-                for bird in self._birds:
-                    if bird.is_alive and object.collides(bird) or bird.y <= 0:
-                        bird.kill()
+    def __pace(self, render: bool) -> None:
+        # limits drawn frames to 60 FPS unless running at max speed
+        if render:
+            self._simulation_clock.wait(self._clock)
 
-            # Draw things to the screen
-            if not self._headless:
-                self._display_text()
+        self._simulation_clock.step()
 
-                # flip() the display to put your work on screen
-                pygame.display.flip()
+    def _start_run(self) -> None:
+        # called once the run's game objects exist, before its first frame
+        pass
+
+    def _end_run(self) -> None:
+        # called after the run's last frame
+        pass
+
+    def _profile_fields(self) -> dict:
+        # extra fields stored with each profiled run
+        return {}
+
+    def run(self) -> None:
+        # Create all the objects required for the game
+        self.__gen_game_objects()
+        self._running = True
+        self._simulation_clock.start_run()
+        if not self._headless:
+            self._renderer.invalidate()
+        self._start_run()
+
+        profiler: FrameProfiler | None = self._profiler
+        if profiler is not None:
+            profiler.start_run()
 
-                # limits FPS to 60, dt is delta time in seconds since last frame, used for framerate
-                self._dt = self._clock.tick(settings.FRAME_RATE) / 1000
+        while self._running:
+            render: bool = not self._headless and self._simulation_clock.renders
 
-            # Control all user input functionality
+            if render:
+                # wipe away anything from last frame
+                self._renderer.begin()
+
+            # Checks to see if the birds still exist
+            if self.birds_alive == 0:
+                self._running = False
+
+            if profiler is None:
+                self._update(render)
+                self._recycle_pipes()
+                self._collide()
+                self.__present(render)
+                self.__pace(render)
+
+                # Control all user input functionality
+                self._input()
+                continue
+
+            # Same frame with every phase timed
+            start: float = time.perf_counter()
+            self._update(render)
+            updated: float = time.perf_counter()
+            self._recycle_pipes()
+            recycled: float = time.perf_counter()
+            self._collide()
+            collided: float = time.perf_counter()
+            self.__present(render)
+            presented: float = time.perf_counter()
+            self.__pace(render)
+            paced: float = time.perf_counter()
             self._input()
+            profiler.frame(updated - start, recycled - updated, collided - recycled,
+                           presented - collided, paced - presented, time.perf_counter() - paced)
+
+        self._end_run()
+        if profiler is not None:
+            profiler.end_run(**self._profile_fields())
 
     def __enter__(self) -> None:
         # Start the graphics if necessary
@@ -0,0 +1,245 @@
+import itertools
+import multiprocessing
+import random
+import traceback
+
+from tqdm import tqdm
+
+import neat
+import neat.config
+import neat.genome
+import neat.reporting
+
+from neat_game import NeatGame
+from policy import EvaluationPolicy
+
+
+class _IslandReporter(neat.reporting.BaseReporter):
+    """Keeps an island's fittest genomes of the last generation and notes when it met fitness_threshold"""
+
+    def __init__(self, config: neat.config.Config, emigrants: int):
+        self._config: neat.config.Config = config
+        self._emigrants: int = emigrants
+        self.top: list[neat.genome.DefaultGenome] = []
+        self.solved: bool = False
+
+    def post_evaluate(self, config, population, species, best_genome) -> None:
+        self.top = sorted(population.values(), key=lambda genome: genome.fitness, reverse=True)[:self._emigrants]
+
+    def found_solution(self, config, generation, best) -> None:
+        # without fitness termination neat reports a solution at the end of every run
+        if not self._config.no_fitness_termination:
+            self.solved = True
+
+
+def _welcome(population: neat.Population, migrants: list[neat.genome.DefaultGenome]) -> None:
+    """Swaps the newest offspring of the population for the migrants and speciates it again"""
+    # elites keep their old keys, so the highest keys are always fresh offspring
+    for key in sorted(population.population, reverse=True)[:len(migrants)]:
+        del population.population[key]
+
+    # migrants get keys from this island so they never collide with its own genomes
+    for migrant in migrants:
+        migrant.key = next(population.reproduction.genome_indexer)
+        migrant.fitness = None
+        population.population[migrant.key] = migrant
+
+    # each island numbers new nodes on its own, so move this island's numbering past the migrants' nodes
+    # or a later add node mutation hands out an id one of their descendants already has
+    genome_config: neat.genome.DefaultGenomeConfig = population.config.genome_config
+    if genome_config.node_indexer is None:
+        # numbering starts after the highest node of whichever genome first adds one, make that all of them
+        next_id: int = max(key for genome in population.population.values() for key in genome.nodes) + 1
+    else:
+        next_id = max(next(genome_config.node_indexer),
+                      max(key for migrant in migrants for key in migrant.nodes) + 1)
+    genome_config.node_indexer = itertools.count(next_id)
+
+    population.species.speciate(population.config, population.population, population.generation)
+
+
+def run_island(index: int, config: neat.config.Config, seed: int, course_seed: int | None, emigrants: int,
+               policy: EvaluationPolicy | None, inbox: multiprocessing.Queue, outbox: multiprocessing.Queue) -> None:
+    """Evolves one island's population for as many generations as each message asks, until sent None.
+
+    Every message carries the migrants to take in first. After evolving, the island reports its generation,
+    best genome ever, fittest genomes to send on and whether it met fitness_threshold.
+    """
+    try:
+        # each island evolves from its own seed, courses included when they aren't fixed
+        random.seed(seed)
+
+        game: NeatGame = NeatGame(headless=True, config=config, seed=course_seed, policy=policy)
+        reporter: _IslandReporter = _IslandReporter(config, emigrants)
+        game.population.add_reporter(reporter)
+
+        with game:
+            while (message := inbox.get()) is not None:
+                generations, migrants = message
+                if migrants:
+                    _welcome(game.population, migrants)
+
+                best_genome: neat.genome.DefaultGenome = game.run(generations=generations, progress=False)
+                outbox.put((index, game.generation, best_genome, reporter.top, reporter.solved, None))
+    except Exception:
+        outbox.put((index, None, None, [], False, traceback.format_exc()))
+
+
+class IslandModel:
+    """Evolves several NEAT populations in their own processes, passing their fittest genomes around a ring.
+
+    Every migration_interval generations each island sends copies of its best genomes to the next island,
+    which takes them in place of its newest offspring. Training ends after the given generations or as soon
+    as any island meets fitness_threshold, and the fittest genome seen on any island is the champion.
+    """
+
+    def __init__(self, config: neat.config.Config, *, islands: int, migration_interval: int = 5, migrants: int = 2,
+                 seed: int | None = None, course_seed: int | None = None, policy: EvaluationPolicy | None = None):
+        if islands <= 0:
+            raise ValueError("Islands must be a positive number")
+        if migration_interval <= 0:
+            raise ValueError("Migration interval must be a positive number")
+        if not 0 <= migrants < config.pop_size:
+            raise ValueError("Migrants must be fewer than the population size")
+
+        self._config: neat.config.Config = config
+        self._migration_interval: int = migration_interval
+        self._migrants: int = migrants
+
+        # island i evolves from seed + i
+        base: int = random.getrandbits(32) if seed is None else seed
+        self._seeds: list[int] = [base + index for index in range(islands)]
+
+        self._inboxes: list[multiprocessing.Queue] = [multiprocessing.Queue() for _ in range(islands)]
+        self._outbox: multiprocessing.Queue = multiprocessing.Queue()
+        self._processes: list[multiprocessing.Process] = [
+            multiprocessing.Process(target=run_island, daemon=True, args=(
+                index, config, island_seed, course_seed, migrants, policy, self._inboxes[index], self._outbox))
+            for index, island_seed in enumerate(self._seeds)]
+        for process in self._processes:
+            process.start()
+
+        self._generation: int = 0
+        self._best_genome: neat.genome.DefaultGenome | None = None
+        self._best_island: int | None = None
+        self._closed: bool = False
+
+    @property
+    def islands(self) -> int:
+        return len(self._processes)
+
+    @property
+    def seeds(self) -> list[int]:
+        return self._seeds
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def best_genome(self) -> neat.genome.DefaultGenome | None:
+        return self._best_genome
+
+    @property
+    def best_island(self) -> int | None:
+        return self._best_island
+
+    def run(self, *, generations: int, progress: bool = True) -> neat.genome.DefaultGenome:
+        if generations <= 0:
+            raise ValueError("Generations must be a positive number")
+
+        progress_bar: tqdm = tqdm(total=generations, disable=not progress)
+        arrivals: list[list[neat.genome.DefaultGenome]] = [[] for _ in self._processes]
+        remaining: int = generations
+        while remaining > 0:
+            epoch: int = min(self._migration_interval, remaining)
+            for inbox, migrants in zip(self._inboxes, arrivals):
+                inbox.put((epoch, migrants))
+
+            # every island reports back before any migrants move, so runs are reproducible from their seeds
+            reports: list[tuple] = sorted(self._outbox.get() for _ in self._processes)
+            for index, _, _, _, _, error in reports:
+                if error is not None:
+                    raise RuntimeError(f"Island {index} failed:\n{error}")
+
+            solved: bool = False
+            for index, generation, best_genome, top, island_solved, _ in reports:
+                if self._best_genome is None or best_genome.fitness > self._best_genome.fitness:
+                    self._best_genome, self._best_island = best_genome, index
+                arrivals[(index + 1) % len(arrivals)] = top
+                solved |= island_solved
+
+            # an island that met fitness_threshold stops short of the epoch
+            self._generation = max(generation for _, generation, *_ in reports)
+            remaining -= epoch
+            progress_bar.update(epoch)
+            progress_bar.set_postfix(best=self._best_genome.fitness, island=self._best_island)
+            if solved:
+                break
+
+        progress_bar.close()
+
+        if progress:
+            print(f"Generations Completely Ran: {self._generation}, "
+                  f"champion from island {self._best_island} with fitness {self._best_genome.fitness}")
+
+        return self._best_genome
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for process in self._processes:
+            process.join()
+
+    def __enter__(self) -> "IslandModel":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    from pathlib import Path
+
+    from champion import save_champions
+    from speciation import VectorSpeciesSet
+
+    parser = argparse.ArgumentParser(description="Train Flappy Bird agents with NEAT on several migrating islands")
+    parser.add_argument("--islands", type=int, default=os.cpu_count(),
+                        help="number of populations, each evolved in its own process")
+    parser.add_argument("--migration-interval", type=int, default=5,
+                        help="generations between migrations")
+    parser.add_argument("--migrants", type=int, default=2,
+                        help="fittest genomes each island sends to the next one per migration")
+    parser.add_argument("--island-seed", type=int, default=None,
+                        help="island i evolves from this seed plus i, random if omitted")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="pipe course every generation is scored on, a fresh course each generation if omitted")
+    parser.add_argument("--max-frames", type=int, default=None,
+                        help="simulate at most this many frames per generation")
+    parser.add_argument("--generations", type=int, default=50,
+                        help="generations every island trains for")
+    args = parser.parse_args()
+
+    config: neat.config.Config = neat.config.Config(
+        neat.DefaultGenome,
+        neat.DefaultReproduction,
+        VectorSpeciesSet,
+        neat.DefaultStagnation,
+        Path(__file__).parent.resolve() / "neat-config.cfg"
+    )
+
+    with IslandModel(config, islands=args.islands, migration_interval=args.migration_interval,
+                     migrants=args.migrants, seed=args.island_seed, course_seed=args.seed,
+                     policy=EvaluationPolicy(max_frames=args.max_frames)) as model:
+        best_genome: neat.genome.DefaultGenome = model.run(generations=args.generations)
+
+    champion_save_path: Path = Path(__file__).parent.resolve() / "neat_player.champ"
+    save_champions(champion_save_path, [best_genome], config,
+                   [{"generation": model.generation, "island": model.best_island}])
@@ -0,0 +1,92 @@
+import csv
+import json
+import time
+from pathlib import Path
+from typing import TextIO
+
+import neat.reporting
+
+
+class MetricsReporter(neat.reporting.BaseReporter):
+    """Appends one line of metrics per generation to a JSONL or CSV file, picked by its extension.
+
+    Lines are buffered and flushed every few seconds, so the file can be tailed while training
+    without a write on every generation and without keeping the history in memory.
+    """
+
+    FIELDS: tuple[str, ...] = ("generation", "time", "best_fitness", "mean_fitness", "species", "genomes",
+                               "frames", "evaluation_seconds", "frames_per_second")
+
+    def __init__(self, path: Path, *, flush_seconds: float = 5.0, buffer_size: int = 64 * 1024):
+        self._path: Path = Path(path)
+        if self._path.suffix not in (".jsonl", ".csv"):
+            raise ValueError(f"Unknown metrics format: {self._path.suffix}, expected .jsonl or .csv")
+
+        self._flush_seconds: float = flush_seconds
+        self._last_flush: float = time.monotonic()
+
+        # appended to so resumed runs carry on the same log, a csv header is only written once
+        new: bool = not self._path.exists() or self._path.stat().st_size == 0
+        self._file: TextIO = open(self._path, "a", buffering=buffer_size, newline="")
+        self._writer: csv.DictWriter | None = None
+        if self._path.suffix == ".csv":
+            self._writer = csv.DictWriter(self._file, fieldnames=self.FIELDS)
+            if new:
+                self._writer.writeheader()
+
+        self._generation: int = 0
+        self._evaluation_start: float = 0.0
+        self._frames: int = 0
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def simulated(self, frames: int) -> None:
+        """Counts frames simulated for the generation being evaluated, reported by the game"""
+        self._frames += frames
+
+    def start_generation(self, generation: int) -> None:
+        self._generation = generation
+        self._frames = 0
+        self._evaluation_start = time.perf_counter()
+
+    def post_evaluate(self, config, population, species, best_genome) -> None:
+        seconds: float = time.perf_counter() - self._evaluation_start
+        fitnesses: list[float] = [genome.fitness for genome in population.values()]
+
+        self.write({
+            "generation": self._generation,
+            "time": time.time(),
+            "best_fitness": max(fitnesses),
+            "mean_fitness": sum(fitnesses) / len(fitnesses),
+            "species": len(species.species),
+            "genomes": len(fitnesses),
+            "frames": self._frames,
+            "evaluation_seconds": seconds,
+            "frames_per_second": self._frames / seconds if seconds else 0.0,
+        })
+
+    def write(self, line: dict) -> None:
+        if self._writer is not None:
+            self._writer.writerow(line)
+        else:
+            self._file.write(json.dumps(line) + "\n")
+
+        # only hand lines to the OS every so often, the file's own buffer holds them until then
+        if time.monotonic() - self._last_flush >= self._flush_seconds:
+            self.flush()
+
+    def flush(self) -> None:
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def found_solution(self, config, generation, best) -> None:
+        self.flush()
+
+    def complete_extinction(self) -> None:
+        self.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from tqdm import tqdm
 
 import neat.config
@@ -6,11 +8,21 @@ import neat.population
 
 import settings
 import neat
+import numpy as np
 import pygame
 
 from bird import Bird
+from checkpoints import AtomicCheckpointer
+from episode import Episode
+from clock import SimulationClock
 from game import Game
-from pipe import Pipes
+from metrics import MetricsReporter
+from network import CompiledNetworks
+from policy import EvaluationPolicy
+from profiler import FrameProfiler
+from sensors import PipeSensor
+from skipping import FrameSkipper
+from swarm import BirdSwarm
 
 
 class classproperty(property):
@@ -19,6 +31,8 @@ class classproperty(property):
 
 
 class NeatBird(Bird):
+    __slots__ = ("_genome", "_net")
+
     # static fitness threshold
     _fitness_threshold: int | None = None
 
@@ -30,35 +44,110 @@ class NeatBird(Bird):
     def fitness_threshold(cls, val: int | None) -> int | None:
         cls._fitness_threshold = val
 
-    def __init__(self, x: float, y: float, genome: neat.genome.DefaultGenome, net: neat.nn.FeedForwardNetwork):
+    def __init__(self, x: float, y: float, genome: neat.genome.DefaultGenome,
+                 net: neat.nn.FeedForwardNetwork | None = None):
         self._genome = genome
+        # birds in a NeatGame generation are driven by its compiled networks instead
         self._net = net
         super().__init__(x, y)
 
     @Bird.check_alive
     def think(self, activation_tuple: tuple[float, float, float]) -> None:
+        self.decide(self._net.activate(activation_tuple)[0])
+
+    @Bird.check_alive
+    def decide(self, output: float) -> None:
         if NeatBird.fitness_threshold and int(NeatBird.fitness_threshold) < self._genome.fitness:
             self.kill()
             return
 
         self._genome.fitness += max(1, 1 * self._genome.fitness / 10_000)
 
-        output: float = self._net.activate(activation_tuple)[0]
-
         if output > settings.NEAT_THRESHOLD:
             self.jump()
 
 
 class NeatGame(Game):
-    def __init__(self, *, headless: bool, config: neat.config.Config):
-        # begin neat genome config
+    # batched networks for the current generation, birds think one by one without them
+    _networks: CompiledNetworks | None = None
+    # worker pool evaluating generations when training in parallel
+    _evaluator = None
+    # training configuration, games replaying a champion go without one
+    _config: neat.config.Config | None = None
+    # when a generation stops before every bird has died
+    _policy: EvaluationPolicy = EvaluationPolicy()
+    # whether the birds are only part of the population, deciding the generation needs all of them
+    _partial: bool = False
+    # per generation metrics log, told how many frames each generation took
+    _metrics: MetricsReporter | None = None
+    # directory the best bird of every generation is recorded to
+    _episodes: Path | None = None
+    _recording: list[np.ndarray] | None = None
+    # carries runs over frames where no bird can jump without asking the networks
+    _skipper: FrameSkipper | None = None
+
+    def __init__(self, *, headless: bool, config: neat.config.Config, workers: int = 1, seed: int | None = None,
+                 clock: SimulationClock | None = None, profiler: FrameProfiler | None = None,
+                 checkpointer: AtomicCheckpointer | None = None, population: neat.Population | None = None,
+                 policy: EvaluationPolicy | None = None, courses: int | None = None, aggregate: str = "mean",
+                 cache_size: int = 10_000, metrics: MetricsReporter | None = None, episodes: Path | None = None,
+                 skip_frames: bool = False):
+        # begin neat genome config, or carry on with a restored population
         self._config: neat.config.Config = config
-        self._population: neat.Population = neat.Population(config)
+        if policy is not None:
+            self._policy = policy
+        self._population: neat.Population = population if population is not None else neat.Population(config)
+
+        # periodically save the population so training can be resumed
+        if checkpointer is not None:
+            if self._population.best_genome is not None:
+                checkpointer.post_evaluate(config, self._population.population,
+                                           self._population.species, self._population.best_genome)
+            self._population.add_reporter(checkpointer)
+
+        # stream per generation metrics to a file
+        if metrics is not None:
+            self._metrics = metrics
+            self._population.add_reporter(metrics)
 
         self._progress_bar: tqdm | None = None
 
+        # evaluate generations across worker processes or several courses, only possible without a window
+        if workers > 1 or courses is not None:
+            if not headless:
+                raise ValueError("Parallel and multi course evaluation require a headless game")
+            if profiler is not None:
+                raise ValueError("Profiling requires generations to be evaluated in process")
+            if episodes is not None:
+                raise ValueError("Recording episodes requires generations to be evaluated in process")
+
+        # frames are only skipped when nothing has to see them
+        if skip_frames:
+            if not headless:
+                raise ValueError("Skipping frames requires a headless game")
+            if profiler is not None:
+                raise ValueError("Profiling requires every frame to be simulated")
+
+        # keep the best bird's run of every generation for replay
+        if episodes is not None:
+            self._episodes = Path(episodes)
+            self._episodes.mkdir(parents=True, exist_ok=True)
+
+        if courses is not None:
+            from evaluation import MultiCourseEvaluator
+            self._evaluator: MultiCourseEvaluator = MultiCourseEvaluator(
+                courses, seed=seed, aggregate=aggregate, cache_size=cache_size, workers=workers, policy=policy,
+                skip_frames=skip_frames)
+        elif workers > 1:
+            from parallel import ShardEvaluator
+            self._evaluator: ShardEvaluator = ShardEvaluator(workers, seed=seed, policy=policy,
+                                                             skip_frames=skip_frames)
+
         # start normal game operation
-        super().__init__(headless=headless)
+        super().__init__(headless=headless, seed=seed, clock=clock, profiler=profiler)
+
+        if skip_frames:
+            self._skipper = FrameSkipper(self._dt)
 
     def _gen_birds(self) -> list[Bird]:
         # set the maximum value birds can get to
@@ -67,9 +156,8 @@ class NeatGame(Game):
         return [NeatBird(
             settings.SCREEN_SIZE.x / 2 - settings.BIRD_SIZE.x / 2,
             settings.SCREEN_SIZE.y / 2,
-            genome,
-            net
-        ) for genome, net in zip(self._genomes, self._nets)]
+            genome
+        ) for genome in self._genomes]
 
     def _input(self) -> None:
         if not self._headless:
@@ -89,91 +177,280 @@ class NeatGame(Game):
             if keys[pygame.K_n]:
                 self._running = False
 
-        # ground height
-        ground_height: float = self._bases[0].y
-
-        # find nearest pipe to the birds
-        nearest_pipe: Pipes = min((pipe for pipe in self._pipes if pipe.x + pipe.width > self._birds[0].x),
-                                  key=lambda pipe: abs(pipe.x - self._birds[0].x))
-
-        # Create the input based on nearest pipe information
-        horizontal_difference: float = abs(nearest_pipe.x - self._birds[0].x)
-        for bird in self._birds:
-            bottom_pipe_difference: float = nearest_pipe.bottom_pipe.y - bird.y
-            top_pipe_difference: float = nearest_pipe.top_pipe.y + \
-                nearest_pipe.top_pipe.height - bird.y
-            ground_difference: float = ground_height - bird.y
-
-            # Allows the bird to jump up
-            bird.think(
-                (
-                    horizontal_difference, top_pipe_difference, bottom_pipe_difference, ground_difference, bird.velocity.y, nearest_pipe.velocity.x
-                )
-            )
-
-    def _display_text(self) -> None:
-        self._screen.blit(self._font.render(
-            f"FPS: {round(self._clock.get_fps(), 1)}", True, (255, 255, 255)), (30, 10))
-        self._screen.blit(self._font.render(
-            f"Birds: {self.birds_alive}", True, (255, 255, 255)), (30, 45))
-        self._screen.blit(self._font.render(
-            f"Gen: {self._population.generation + 1}", True, (255, 255, 255)), (30, 80))
-        self._screen.blit(self._font.render(
-            f"Fit: {max(bird._genome.fitness for bird in self._birds)}", True, (255, 255, 255)), (30, 115))
+        # every bird decides at once, then acts on it
+        jumps: np.ndarray = self._jumps()
+        if self._recording is not None:
+            self._recording.append(np.packbits(jumps))
+        self.__decide(jumps)
+
+        if self.__finished():
+            self._running = False
+
+        # carry on to the next jump in one batched step, the networks are asked about it all at once
+        if self._skipper is not None and self._networks is not None and self._running:
+            self._skipper.advance(self._swarm, self._obstacles, self.__forecast, self.__quiet_frame)
+
+    def __finished(self) -> bool:
+        return self._policy.finished(frame=self._simulation_clock.frame, fitness=self._fitness,
+                                     alive=self._swarm.alive, cap=NeatBird.fitness_threshold, config=self._config,
+                                     partial=self._partial)
+
+    def __forecast(self, y: np.ndarray, vy: np.ndarray, pipe_x: np.ndarray, vx: np.ndarray) -> np.ndarray:
+        """Which birds their networks want to jump on each of several frames ahead, one row per frame"""
+        inputs: np.ndarray = self._sensor.observe_frames(
+            float(self._swarm.x[0]), y, vy, self._obstacles, pipe_x, vx)
+
+        return self._networks.activate_frames(inputs)[:, :, 0] > settings.NEAT_THRESHOLD
+
+    def __quiet_frame(self, jumps: np.ndarray) -> bool:
+        """Ends a frame carried by the skipper, as _input would"""
+        self._simulation_clock.step()
+
+        # any bird that wants to jump here is dead or not able to yet, birds that died in the window
+        # were forecast as if still flying, but their jumps are never replayed
+        if self._recording is not None:
+            self._recording.append(np.packbits(jumps))
+        self.__decide(self._no_jumps)
+
+        if self.__finished():
+            self._running = False
+
+        return not self._running
+
+    def _jumps(self) -> np.ndarray:
+        """Which birds their networks want to jump this frame"""
+        # Create the input based on nearest pipe information for the whole swarm at once
+        swarm: BirdSwarm = self._swarm
+        inputs: np.ndarray = self._sensor.observe(swarm, self._obstacles)
+
+        if self._networks is None:
+            # birds with a network of their own think one by one
+            outputs: np.ndarray = np.zeros(len(swarm))
+            for slot in np.flatnonzero(swarm.alive).tolist():
+                outputs[slot] = self._birds[slot]._net.activate(tuple(inputs[slot].tolist()))[0]
+        else:
+            # one batched pass through every network
+            outputs = self._networks.activate(inputs)[:, 0]
+
+        return outputs > settings.NEAT_THRESHOLD
+
+    def __decide(self, jumps: np.ndarray) -> None:
+        """Mirrors NeatBird.decide for every living bird at once"""
+        swarm: BirdSwarm = self._swarm
+        fitness: np.ndarray = self._fitness
+
+        # birds past the fitness cap die without scoring
+        if NeatBird.fitness_threshold:
+            swarm.kill(fitness > int(NeatBird.fitness_threshold))
+
+        # the rest score for surviving the frame, then jump if their network says so
+        np.add(fitness, np.maximum(1.0, fitness / 10_000), out=fitness, where=swarm.alive)
+        swarm.jump(jumps)
+
+    def _start_run(self) -> None:
+        self._sensor: PipeSensor = PipeSensor(len(self._birds))
+        self._no_jumps: np.ndarray = np.zeros(len(self._birds), np.bool_)
+
+        # fitness is kept in one array during a run and handed back to the genomes afterwards
+        self._fitness: np.ndarray = np.fromiter(
+            (bird._genome.fitness for bird in self._birds), np.float64, len(self._birds))
+
+        # every frame's jump decisions, one bit per bird, when the best bird's episode is kept
+        self._start_state: np.ndarray | None = None
+        if self._episodes is not None:
+            swarm: BirdSwarm = self._swarm
+            self._start_state = np.stack([swarm.x, swarm.y, swarm.vx, swarm.vy], axis=1)
+            self._recording = []
+
+    def episode(self, slot: int) -> Episode:
+        """The recorded run of the bird in the slot, once the run has ended"""
+        jumps: np.ndarray = np.unpackbits(np.stack(self._recording), axis=1, count=len(self._birds))[:, slot]
+
+        return Episode(seed=self._course.seed, timestep=self._dt, start=tuple(self._start_state[slot].tolist()),
+                       jumps=jumps, fitness=float(self._fitness[slot]), cap=NeatBird.fitness_threshold)
+
+    def _end_run(self) -> None:
+        for bird, fitness in zip(self._birds, self._fitness.tolist()):
+            bird._genome.fitness = fitness
+
+    @property
+    def best_fitness(self) -> float:
+        """Best fitness of the current run so far"""
+        return float(self._fitness.max())
+
+    def _display_text(self) -> list[str]:
+        return [
+            f"FPS: {round(self._clock.get_fps(), 1)}",
+            f"Birds: {self.birds_alive}",
+            f"Gen: {self._population.generation + 1}",
+            f"Fit: {self.best_fitness}",
+        ]
+
+    @classmethod
+    def from_checkpoint(cls, path: Path, **kwargs) -> "NeatGame":
+        population: neat.Population = AtomicCheckpointer.restore_checkpoint(path)
+        return cls(config=population.config, population=population, **kwargs)
+
+    @property
+    def generation(self) -> int:
+        return self._population.generation
+
+    @property
+    def population(self) -> neat.Population:
+        return self._population
+
+    def _profile_fields(self) -> dict:
+        return {
+            "generation": self._population.generation,
+            "genomes": len(self._genomes),
+            "best_fitness": max(genome.fitness for genome in self._genomes),
+        }
 
     def __eval_gen(self, genomes: tuple[str, neat.genome.DefaultGenome], config: neat.config.Config) -> None:
-        self._genomes: list[neat.genome.DefaultGenome] = []
-        self._nets: list[neat.nn.FeedForwardNetwork] = []
+        if self._evaluator is not None:
+            self._evaluator.evaluate(genomes, config)
+            if self._metrics is not None:
+                self._metrics.simulated(self._evaluator.frames)
+            self._progress_bar.update(1)
+            return
 
-        # split genomes into their respective lists
-        for genome_id, genome in genomes:
+        self._genomes: list[neat.genome.DefaultGenome] = [genome for _, genome in genomes]
+        for genome in self._genomes:
             genome.fitness = 0.0
-            self._genomes.append(genome)
 
-            net: neat.nn.FeedForwardNetwork = neat.nn.FeedForwardNetwork.create(
-                genome, config)
-            self._nets.append(net)
+        # compile the whole generation into one batched network program
+        self._networks = CompiledNetworks(self._genomes, config)
 
         super().run()
+        if self._metrics is not None:
+            self._metrics.simulated(self.frames)
+        if self._episodes is not None:
+            self.episode(int(np.argmax(self._fitness))).save(
+                self._episodes / f"generation-{self._population.generation}.episode")
         self._progress_bar.update(1)
 
-    def run(self, *, generations: int):
+    def run(self, *, generations: int, progress: bool = True):
         if generations <= 0:
             raise ValueError("Generations must be a positive number")
 
-        self._progress_bar: tqdm = tqdm(total=generations)
+        self._progress_bar: tqdm = tqdm(total=generations, disable=not progress)
 
         best_genome = self._population.run(self.__eval_gen, generations)
 
         self._progress_bar.close()
 
-        print(f"Generations Completely Ran: {self._population.generation}")
+        if progress:
+            print(f"Generations Completely Ran: {self._population.generation}")
 
         return best_genome
 
+    def close(self) -> None:
+        super().close()
 
-if __name__ == "__main__":
-    import pickle
-    from pathlib import Path
-
-    config_path: Path = Path(
-        "/home/karsten/Coding/Python/Flappy Bird/src/neat-config.cfg")
-
-    config: neat.config.Config = neat.config.Config(
-        neat.DefaultGenome,
-        neat.DefaultReproduction,
-        neat.DefaultSpeciesSet,
-        neat.DefaultStagnation,
-        config_path
-    )
+        if self._evaluator is not None:
+            self._evaluator.close()
 
-    with NeatGame(headless=True, config=config) as game:
-        best_genome = game.run(generations=50)
-        best_net: neat.nn.FeedForwardNetwork = neat.nn.FeedForwardNetwork.create(
-            best_genome, config)
+        if self._metrics is not None:
+            self._metrics.close()
 
-        pickle_save_path: Path = Path(
-            __file__).parent.resolve() / "neat_player.pkl"
 
-        pickle.dump(NeatBird(0, 0, genome=best_genome, net=best_net),
-                    open(pickle_save_path, 'wb'), pickle.HIGHEST_PROTOCOL)
+if __name__ == "__main__":
+    import argparse
+
+    from champion import save_champions
+    from speciation import VectorSpeciesSet
+
+    parser = argparse.ArgumentParser(description="Train Flappy Bird agents with NEAT")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of processes evaluating each generation")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="pipe course every generation is scored on, a fresh course each generation if omitted")
+    parser.add_argument("--window", action="store_true",
+                        help="watch training in a game window")
+    parser.add_argument("--render-every-generation", type=int, default=1,
+                        help="only draw every Nth generation, the rest run unthrottled")
+    parser.add_argument("--render-every-frame", type=int, default=1,
+                        help="only draw every Nth frame of a drawn generation")
+    parser.add_argument("--max-speed", action="store_true",
+                        help="never throttle drawn frames to real time")
+    parser.add_argument("--courses", type=int, default=None,
+                        help="score every genome on this many seeded courses, caching results per genome")
+    parser.add_argument("--aggregate", choices=("mean", "min"), default="mean",
+                        help="how the fitness of every course is combined")
+    parser.add_argument("--cache-size", type=int, default=10_000,
+                        help="most genome and course results kept in the cache")
+    parser.add_argument("--stop-when-decided", action="store_true",
+                        help="end a generation as soon as it meets fitness_threshold")
+    parser.add_argument("--max-frames", type=int, default=None,
+                        help="simulate at most this many frames per generation")
+    parser.add_argument("--metrics", type=Path, default=None,
+                        help="append per generation metrics to this .jsonl or .csv file")
+    parser.add_argument("--episodes", type=Path, default=None,
+                        help="record the best bird of every generation to this directory for replay")
+    parser.add_argument("--skip-frames", action="store_true",
+                        help="simulate the frames between jumps in one batched step, headless only")
+    parser.add_argument("--profile", type=Path, default=None,
+                        help="write per generation phase timings to this .json or .csv file")
+    parser.add_argument("--generations", type=int, default=50,
+                        help="total generations to train, including any resumed ones")
+    parser.add_argument("--checkpoint-dir", type=Path, default=Path(__file__).parent.resolve() / "checkpoints",
+                        help="directory population checkpoints are written to")
+    parser.add_argument("--checkpoint-every", type=int, default=5,
+                        help="generations between checkpoints")
+    parser.add_argument("--resume", type=Path, nargs="?", const="latest", default=None,
+                        help="continue from a checkpoint, the latest in --checkpoint-dir if no file is given")
+    args = parser.parse_args()
+
+    clock: SimulationClock = SimulationClock(
+        render_every_run=args.render_every_generation,
+        render_every_frame=args.render_every_frame,
+        max_speed=args.max_speed
+    )
+
+    policy: EvaluationPolicy = EvaluationPolicy(stop_when_decided=args.stop_when_decided, max_frames=args.max_frames)
+    profiler: FrameProfiler | None = FrameProfiler() if args.profile is not None else None
+    checkpointer: AtomicCheckpointer = AtomicCheckpointer(
+        args.checkpoint_dir, generation_interval=args.checkpoint_every)
+    metrics: MetricsReporter | None = MetricsReporter(args.metrics) if args.metrics is not None else None
+    options: dict = dict(headless=not args.window, workers=args.workers, seed=args.seed, clock=clock,
+                         profiler=profiler, checkpointer=checkpointer, policy=policy, courses=args.courses,
+                         aggregate=args.aggregate, cache_size=args.cache_size, metrics=metrics,
+                         episodes=args.episodes, skip_frames=args.skip_frames)
+
+    if args.resume is not None:
+        resume_path: Path | None = AtomicCheckpointer.latest(
+            args.checkpoint_dir) if str(args.resume) == "latest" else args.resume
+        if resume_path is None:
+            raise FileNotFoundError(f"No checkpoint to resume from in {args.checkpoint_dir}")
+
+        game: NeatGame = NeatGame.from_checkpoint(resume_path, **options)
+    else:
+        config_path: Path = Path(__file__).parent.resolve() / "neat-config.cfg"
+
+        config: neat.config.Config = neat.config.Config(
+            neat.DefaultGenome,
+            neat.DefaultReproduction,
+            VectorSpeciesSet,
+            neat.DefaultStagnation,
+            config_path
+        )
+
+        game: NeatGame = NeatGame(config=config, **options)
+
+    with game:
+        # a resumed run only plays the generations it has left, one that already finished keeps its best genome
+        remaining: int = args.generations - game.generation
+        if remaining > 0 or game.population.best_genome is None:
+            best_genome = game.run(generations=remaining)
+        else:
+            best_genome = game.population.best_genome
+            print(f"Generations Completely Ran: {game.generation}")
+
+        if profiler is not None:
+            profiler.export(args.profile)
+
+        champion_save_path: Path = Path(
+            __file__).parent.resolve() / "neat_player.champ"
+
+        save_champions(champion_save_path, [best_genome], game._config,
+                       [{"generation": game.generation}])
@@ -0,0 +1,239 @@
+from typing import Callable
+
+import numpy as np
+
+import neat.config
+import neat.genome
+from neat.graphs import feed_forward_layers
+
+
+# numpy versions of neat-python's built in activation functions
+_ACTIVATIONS: dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "sigmoid": lambda z: 1.0 / (1.0 + np.exp(-np.clip(5.0 * z, -60.0, 60.0))),
+    "tanh": lambda z: np.tanh(np.clip(2.5 * z, -60.0, 60.0)),
+    "sin": lambda z: np.sin(np.clip(5.0 * z, -60.0, 60.0)),
+    "gauss": lambda z: np.exp(-5.0 * np.clip(z, -3.4, 3.4) ** 2),
+    "relu": lambda z: np.where(z > 0.0, z, 0.0),
+    "softplus": lambda z: 0.2 * np.log(1 + np.exp(np.clip(5.0 * z, -60.0, 60.0))),
+    "identity": lambda z: z,
+    "clamped": lambda z: np.clip(z, -1.0, 1.0),
+    "inv": lambda z: np.divide(1.0, z, out=np.zeros_like(z), where=z != 0.0),
+    "log": lambda z: np.log(np.maximum(z, 1e-7)),
+    "exp": lambda z: np.exp(np.clip(z, -60.0, 60.0)),
+    "abs": np.abs,
+    "hat": lambda z: np.maximum(0.0, 1 - np.abs(z)),
+    "square": np.square,
+    "cube": lambda z: z ** 3,
+}
+
+
+class CompiledNetworks:
+    """A population of feed forward networks flattened into one topologically ordered array program.
+
+    Every genome's evaluated nodes are laid out in the order FeedForwardNetwork.create would run them,
+    so step k evaluates the k-th node of every genome at once.
+    """
+
+    # flat arrays the whole program is stored in, see arrays() and from_arrays()
+    ARRAYS: tuple[str, ...] = ("node_slots", "node_bias", "node_response", "node_activation", "node_offsets",
+                               "edge_sources", "edge_targets", "edge_weights", "edge_offsets", "output_slots")
+
+    def __init__(self, genomes: list[neat.genome.DefaultGenome], config: neat.config.Config):
+        genome_config = config.genome_config
+        self._size: int = len(genomes)
+        self._num_inputs: int = len(genome_config.input_keys)
+        self._num_outputs: int = len(genome_config.output_keys)
+        self._activations: list[str] = list(_ACTIVATIONS)
+
+        # per genome node orders, the padded width is only known after every genome is walked
+        programs: list[list] = [self.__program(genome, genome_config) for genome in genomes]
+        steps: int = max((len(program) for program in programs), default=0)
+
+        # value slots per genome: inputs, evaluated nodes, then a slot that always stays 0.0
+        self._width: int = self._num_inputs + steps + 1
+        zero_slot: int = self._width - 1
+
+        output_slots: np.ndarray = np.full((self._size, self._num_outputs), zero_slot, np.int64)
+
+        step_slots: list[list[int]] = [[] for _ in range(steps)]
+        step_bias: list[list[float]] = [[] for _ in range(steps)]
+        step_response: list[list[float]] = [[] for _ in range(steps)]
+        step_activation: list[list[int]] = [[] for _ in range(steps)]
+        step_sources: list[list[int]] = [[] for _ in range(steps)]
+        step_targets: list[list[int]] = [[] for _ in range(steps)]
+        step_weights: list[list[float]] = [[] for _ in range(steps)]
+
+        for row, program in enumerate(programs):
+            offset: int = row * self._width
+            slots: dict[int, int] = {key: index for index, key in enumerate(genome_config.input_keys)}
+            for step, (node, activation, bias, response, links) in enumerate(program):
+                slots[node] = self._num_inputs + step
+
+                target: int = len(step_slots[step])
+                step_slots[step].append(offset + slots[node])
+                step_bias[step].append(bias)
+                step_response[step].append(response)
+                step_activation[step].append(self._activations.index(activation))
+                for source, weight in links:
+                    step_sources[step].append(offset + slots[source])
+                    step_targets[step].append(target)
+                    step_weights[step].append(weight)
+
+            # outputs that are never evaluated read as 0.0 like FeedForwardNetwork
+            for index, key in enumerate(genome_config.output_keys):
+                if key in slots:
+                    output_slots[row, index] = slots[key]
+
+        output_slots += (np.arange(self._size, dtype=np.int64) * self._width)[:, None]
+
+        def flatten(steps: list[list], dtype: type) -> np.ndarray:
+            return np.fromiter((value for step in steps for value in step), dtype)
+
+        def offsets(steps: list[list]) -> np.ndarray:
+            return np.cumsum([0, *(len(step) for step in steps)], dtype=np.int64)
+
+        self._arrays: dict[str, np.ndarray] = {
+            "node_slots": flatten(step_slots, np.int64),
+            "node_bias": flatten(step_bias, np.float64),
+            "node_response": flatten(step_response, np.float64),
+            "node_activation": flatten(step_activation, np.uint8),
+            "node_offsets": offsets(step_slots),
+            "edge_sources": flatten(step_sources, np.int64),
+            "edge_targets": flatten(step_targets, np.int64),
+            "edge_weights": flatten(step_weights, np.float64),
+            "edge_offsets": offsets(step_sources),
+            "output_slots": output_slots,
+        }
+        self.__prepare()
+
+    @classmethod
+    def from_arrays(cls, header: dict, arrays: dict[str, np.ndarray]) -> "CompiledNetworks":
+        """Rebuilds networks from arrays() and header without copying the arrays, so they may be memory mapped"""
+        networks: CompiledNetworks = cls.__new__(cls)
+        networks._size = header["size"]
+        networks._num_inputs = header["num_inputs"]
+        networks._num_outputs = header["num_outputs"]
+        networks._width = header["width"]
+        networks._activations = header["activations"]
+        networks._arrays = {name: arrays[name] for name in cls.ARRAYS}
+        networks.__prepare()
+
+        return networks
+
+    @property
+    def header(self) -> dict:
+        return {
+            "size": self._size,
+            "num_inputs": self._num_inputs,
+            "num_outputs": self._num_outputs,
+            "width": self._width,
+            "activations": self._activations,
+        }
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        return self._arrays
+
+    def __prepare(self) -> None:
+        arrays: dict[str, np.ndarray] = self._arrays
+        node_offsets: np.ndarray = arrays["node_offsets"]
+        edge_offsets: np.ndarray = arrays["edge_offsets"]
+
+        # slice every step's share of the flat arrays once, these are views rather than copies
+        self._program: list[tuple] = []
+        for step in range(len(node_offsets) - 1):
+            nodes: slice = slice(node_offsets[step], node_offsets[step + 1])
+            edges: slice = slice(edge_offsets[step], edge_offsets[step + 1])
+
+            activations: np.ndarray = arrays["node_activation"][nodes]
+            groups: list[tuple[Callable, np.ndarray]] = []
+            for code in np.unique(activations).tolist():
+                name: str = self._activations[code]
+                if name not in _ACTIVATIONS:
+                    raise ValueError(f"Unsupported activation for compiled networks: {name}")
+                groups.append((_ACTIVATIONS[name], np.flatnonzero(activations == code)))
+
+            self._program.append((
+                arrays["node_slots"][nodes],
+                arrays["node_bias"][nodes],
+                arrays["node_response"][nodes],
+                groups,
+                arrays["edge_sources"][edges],
+                arrays["edge_targets"][edges],
+                arrays["edge_weights"][edges],
+            ))
+
+        self._output_slots: np.ndarray = arrays["output_slots"]
+        self._values: np.ndarray = np.zeros(self._size * self._width)
+
+    @staticmethod
+    def __program(genome: neat.genome.DefaultGenome, genome_config) -> list:
+        # Gather expressed connections the same way FeedForwardNetwork.create does
+        connections: list[tuple[int, int]] = [cg.key for cg in genome.connections.values() if cg.enabled]
+        incoming: dict[int, list[tuple[int, float]]] = {}
+        for key in connections:
+            incoming.setdefault(key[1], []).append((key[0], genome.connections[key].weight))
+
+        program: list = []
+        for layer in feed_forward_layers(genome_config.input_keys, genome_config.output_keys, connections):
+            for node in layer:
+                ng = genome.nodes[node]
+                if ng.aggregation != "sum":
+                    raise ValueError(f"Unsupported aggregation for compiled networks: {ng.aggregation}")
+                if ng.activation not in _ACTIVATIONS:
+                    raise ValueError(f"Unsupported activation for compiled networks: {ng.activation}")
+
+                program.append((node, ng.activation, ng.bias, ng.response, incoming.get(node, [])))
+
+        return program
+
+    def __len__(self) -> int:
+        return self._size
+
+    def activate(self, inputs: np.ndarray) -> np.ndarray:
+        """Evaluates every network on its own row of inputs, returning one row of outputs per network"""
+        values: np.ndarray = self._values
+        view: np.ndarray = values.reshape(self._size, self._width)
+        view[:, :self._num_inputs] = inputs
+
+        for slots, bias, response, groups, sources, targets, weights in self._program:
+            total: np.ndarray = np.bincount(
+                targets, weights=values[sources] * weights, minlength=len(slots))
+            total *= response
+            total += bias
+
+            if len(groups) == 1:
+                values[slots] = groups[0][0](total)
+                continue
+
+            for activation, members in groups:
+                values[slots[members]] = activation(total[members])
+
+        return values[self._output_slots]
+
+    def activate_frames(self, inputs: np.ndarray) -> np.ndarray:
+        """activate over several frames of inputs at once, shaped (frames, networks, inputs).
+
+        Every frame's sums are added in the same order as activate adds them, so each frame's
+        outputs are exactly what activate would return for it.
+        """
+        frames: int = len(inputs)
+        values: np.ndarray = np.zeros((frames, self._size * self._width))
+        values.reshape(frames, self._size, self._width)[:, :, :self._num_inputs] = inputs
+
+        for slots, bias, response, groups, sources, targets, weights in self._program:
+            # each frame's targets get bins of their own
+            bins: np.ndarray = targets + (np.arange(frames) * len(slots))[:, np.newaxis]
+            total: np.ndarray = np.bincount(
+                bins.ravel(), weights=(values[:, sources] * weights).ravel(),
+                minlength=frames * len(slots)).reshape(frames, len(slots))
+            total *= response
+            total += bias
+
+            if len(groups) == 1:
+                values[:, slots] = groups[0][0](total)
+                continue
+
+            for activation, members in groups:
+                values[:, slots[members]] = activation(total[:, members])
+
+        return values[:, self._output_slots]
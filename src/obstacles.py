@@ -0,0 +1,215 @@
+import numpy as np
+
+import settings
+
+from assets import ASSETS
+from collision import Edges, rect_span
+from course import Course
+from pipe import Pipes
+from render import Sprites
+
+
+class ObstaclePool:
+    """A fixed pool of pipe and ground slots for one or more games, scrolled by one update per frame.
+
+    Obstacles keep world positions, where they would be had nothing scrolled, and sit on screen at their
+    world position plus a scroll offset. A game's pipes share one speed and one offset, the ground scrolls
+    at its own constant speed. A pipe leaving the screen is recycled in place as the next pipe of the
+    course, so the pipe slots form a ring in x order starting at the leftmost pipe. Every game has a row
+    of its own in each array, so all games are stepped by the same handful of array operations.
+    """
+
+    # pipe pairs and pieces of ground on screen at once
+    PIPES: int = 2
+    BASES: int = 5
+
+    PIPE_WIDTH: float = settings.PIPE_SIZE.x
+    PIPE_HEIGHT: float = settings.PIPE_SIZE.y
+    BASE_WIDTH: float = settings.BASE_SIZE.x
+    BASE_HEIGHT: float = settings.BASE_SIZE.y
+
+    # sizes of the rects edges lays out, top pipes then bottom pipes then ground
+    _WIDTHS: np.ndarray = np.array([PIPE_WIDTH] * (2 * PIPES) + [BASE_WIDTH] * BASES)
+    _HEIGHTS: np.ndarray = np.array([PIPE_HEIGHT] * (2 * PIPES) + [BASE_HEIGHT] * BASES)
+
+    def __init__(self, courses: list[Course]):
+        games: int = len(courses)
+        if games <= 0:
+            raise ValueError("An obstacle pool needs at least one course")
+
+        self._courses: list[Course] = list(courses)
+        self._rows: np.ndarray = np.arange(games)
+
+        # added to world positions to place pipes and ground on screen, one per game
+        self._scroll: np.ndarray = np.zeros(games)
+        self._vx: np.ndarray = np.zeros(games)
+        self._ground_scroll: np.ndarray = np.zeros(games)
+        self._ground_vx: float = settings.BASE_VELOCITY.x
+        self._ground: float = settings.SCREEN_SIZE.y - self.BASE_HEIGHT / 2
+
+        # slot of every game's leftmost pipe, and how many pipes of its course have been placed so far
+        self._head: np.ndarray = np.zeros(games, np.intp)
+        self._count: np.ndarray = np.zeros(games, np.intp)
+
+        self._pipe_world: np.ndarray = np.zeros((games, self.PIPES))
+        self._base_world: np.ndarray = np.zeros((games, self.BASES))
+        # world position of every game's leftmost pipe
+        self._head_world: np.ndarray = np.zeros(games)
+
+        # y of every rect edges lays out, the pipes' rows are views into it
+        self._rect_y: np.ndarray = np.full((games, 2 * self.PIPES + self.BASES), self._ground)
+        self._top_y: np.ndarray = self._rect_y[:, :self.PIPES]
+        self._bottom_y: np.ndarray = self._rect_y[:, self.PIPES:2 * self.PIPES]
+        # top and bottom edges of every rect, which only move when a pipe is placed
+        self._rect_top: np.ndarray
+        self._rect_bottom: np.ndarray
+
+        self.restart(self._rows, self._courses)
+
+    def __place(self, game: int, slot: int, x: float) -> None:
+        """Puts the next pipe of the game's course in the slot at screen position x"""
+        # laid out like Pipes, the top pipe hangs down from above the screen
+        top: float = -self._courses[game].height(int(self._count[game]))
+        self._count[game] += 1
+
+        self._pipe_world[game, slot] = x - self._scroll[game]
+        self._top_y[game, slot] = top
+        self._bottom_y[game, slot] = top + Pipes._pipe_offset + settings.PIPE_GAP
+
+    def restart(self, games: np.ndarray, courses: list[Course]) -> None:
+        """Starts each of the games over on the course given for it"""
+        self._scroll[games] = 0.0
+        self._vx[games] = settings.PIPE_VELOCITY.x
+        self._ground_scroll[games] = 0.0
+        self._head[games] = 0
+        self._count[games] = 0
+        self._base_world[games] = [-10.0 + self.BASE_WIDTH * piece for piece in range(self.BASES)]
+
+        for game, course in zip(np.asarray(games).tolist(), courses):
+            self._courses[game] = course
+            for slot in range(self.PIPES):
+                self.__place(game, slot, settings.PIPE_INITIAL_X * (slot + 1))
+            self._head_world[game] = self._pipe_world[game, 0]
+
+        self._rect_top, self._rect_bottom = rect_span(self._rect_y, self._HEIGHTS)
+
+    @property
+    def games(self) -> int:
+        return len(self._courses)
+
+    @property
+    def courses(self) -> list[Course]:
+        """Course every game is playing"""
+        return self._courses
+
+    @property
+    def scroll(self) -> np.ndarray:
+        return self._scroll
+
+    @property
+    def vx(self) -> np.ndarray:
+        """x velocity every pipe of a game shares"""
+        return self._vx
+
+    @property
+    def ground_scroll(self) -> np.ndarray:
+        return self._ground_scroll
+
+    @property
+    def ground_vx(self) -> float:
+        return self._ground_vx
+
+    @property
+    def ground(self) -> float:
+        """y of the top of the ground"""
+        return self._ground
+
+    @property
+    def head(self) -> np.ndarray:
+        """Slot of every game's leftmost pipe, the slots follow it from left to right around the ring"""
+        return self._head
+
+    @property
+    def order(self) -> np.ndarray:
+        """Every game's pipe slots from left to right"""
+        return (self._head[:, np.newaxis] + np.arange(self.PIPES)) % self.PIPES
+
+    @property
+    def pipe_world(self) -> np.ndarray:
+        return self._pipe_world
+
+    @property
+    def pipe_x(self) -> np.ndarray:
+        """Screen x of every pipe slot"""
+        return self._pipe_world + self._scroll[:, np.newaxis]
+
+    @property
+    def top_y(self) -> np.ndarray:
+        return self._top_y
+
+    @property
+    def bottom_y(self) -> np.ndarray:
+        return self._bottom_y
+
+    @property
+    def base_world(self) -> np.ndarray:
+        return self._base_world
+
+    def update(self, delta: float) -> None:
+        """Scrolls every pipe and piece of ground by one step"""
+        self._scroll += self._vx * delta
+        self._ground_scroll += self._ground_vx * delta
+
+        # ground leaving the screen wraps back around to the right, like Base.update, a float sum is only
+        # ever zero or below when the exact sum is, so x + width <= 0 is checked as x <= -width
+        wrapped: np.ndarray = self._base_world + self._ground_scroll[:, np.newaxis] <= -self.BASE_WIDTH
+        if wrapped.any():
+            self._base_world[wrapped] += settings.SCREEN_SIZE.x + self.BASE_WIDTH
+
+    def recycle(self) -> None:
+        """Accelerates the pipes and moves any that left the screen to the back of their course"""
+        self._vx += settings.PIPE_ACCELERATION.x
+
+        # only a game's leftmost pipe can have left the screen, which happens every few seconds at most
+        while (games := np.flatnonzero(self._head_world + self._scroll <= -self.PIPE_WIDTH)).size:
+            for game in games.tolist():
+                head: int = int(self._head[game])
+                self.__place(game, head, settings.PIPE_INITIAL_X * self.PIPES)
+                self._head[game] = head = (head + 1) % self.PIPES
+                self._head_world[game] = self._pipe_world[game, head]
+
+            self._rect_top, self._rect_bottom = rect_span(self._rect_y, self._HEIGHTS)
+
+    def move(self, *, scroll: float, vx: float, ground_scroll: float, base_world: np.ndarray) -> None:
+        """Jumps a single game straight to a later frame, as worked out by FrameSkipper"""
+        self._scroll[:] = scroll
+        self._vx[:] = vx
+        self._ground_scroll[:] = ground_scroll
+        self._base_world[:] = base_world
+
+    def edges(self, pipe_x: np.ndarray | None = None, base_x: np.ndarray | None = None) -> Edges:
+        """Edges of every rect, one row per game and one column per rect: top pipes, bottom pipes, then ground.
+
+        pipe_x and base_x place a single game's pipe slots and ground elsewhere, one row of positions each,
+        such as on the frames FrameSkipper looks ahead.
+        """
+        if pipe_x is None:
+            pipe_x = self.pipe_x
+        if base_x is None:
+            base_x = self._base_world + self._ground_scroll[:, np.newaxis]
+
+        left, right = rect_span(np.concatenate((pipe_x, pipe_x, base_x), axis=1), self._WIDTHS)
+        return left, self._rect_top, right, self._rect_bottom
+
+    def sprites(self) -> Sprites:
+        """Mirrors Pipes.sprites and Base.sprites for every obstacle of the first game"""
+        pipe_x: np.ndarray = self.pipe_x[0]
+        sprites: Sprites = []
+        for slot in self.order[0].tolist():
+            x: float = float(pipe_x[slot])
+            sprites.append((ASSETS["pipe-reversed"], (x, float(self._top_y[0, slot]))))
+            sprites.append((ASSETS["pipe"], (x, float(self._bottom_y[0, slot]))))
+
+        ground_scroll: float = float(self._ground_scroll[0])
+        sprites += [(ASSETS["base"], (world + ground_scroll, self._ground)) for world in self._base_world[0].tolist()]
+        return sprites
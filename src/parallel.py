@@ -0,0 +1,127 @@
+import multiprocessing
+import multiprocessing.pool
+
+import neat
+import neat.config
+import neat.genome
+
+import settings
+
+from course import Course
+from network import CompiledNetworks
+from neat_game import NeatGame
+from policy import EvaluationPolicy
+from skipping import FrameSkipper
+
+
+class ShardGame(NeatGame):
+    """Headless game over a fixed slice of a generation's genomes, run inside a worker process"""
+
+    _partial: bool = True
+
+    def __init__(self, *, genomes: list[neat.genome.DefaultGenome], config: neat.config.Config, seed: int,
+                 policy: EvaluationPolicy | None = None, networks: CompiledNetworks | None = None,
+                 skip_frames: bool = False):
+        self._config: neat.config.Config = config
+        self._genomes: list[neat.genome.DefaultGenome] = genomes
+        # networks compiled ahead of time, such as a champion file's, are flown as they are
+        self._networks: CompiledNetworks = networks if networks is not None else CompiledNetworks(genomes, config)
+        if policy is not None:
+            self._policy = policy
+
+        # start normal game operation without a population of its own
+        super(NeatGame, self).__init__(headless=True, seed=seed)
+
+        if skip_frames:
+            self._skipper = FrameSkipper(self._dt)
+
+    def run(self) -> None:
+        super(NeatGame, self).run()
+
+
+def simulate_shard(genomes: list[neat.genome.DefaultGenome], config: neat.config.Config, seed: int,
+                   policy: EvaluationPolicy | None = None, skip_frames: bool = False) -> tuple[list[float], int]:
+    """Fitness of every genome on the seed's course, and the frames it took to find out"""
+    for genome in genomes:
+        genome.fitness = 0.0
+
+    # every shard of a generation sees the same pipe course
+    game: ShardGame = ShardGame(genomes=genomes, config=config, seed=seed, policy=policy, skip_frames=skip_frames)
+    game.run()
+
+    return [genome.fitness for genome in genomes], game.frames
+
+
+def eval_genome(genome: neat.genome.DefaultGenome, config: neat.config.Config) -> float:
+    """Scores a single genome, the eval_function contract of neat.ParallelEvaluator"""
+    fitnesses, _ = simulate_shard([genome], config, settings.COURSE_SEED)
+    return fitnesses[0]
+
+
+class ShardEvaluator:
+    """Splits each generation into shards simulated by a pool of worker processes"""
+
+    # shards per worker so a long lived bird doesn't leave the other workers idle
+    _SHARDS_PER_WORKER: int = 4
+
+    def __init__(self, num_workers: int, *, seed: int | None = None, policy: EvaluationPolicy | None = None,
+                 skip_frames: bool = False):
+        if num_workers <= 0:
+            raise ValueError("Workers must be a positive number")
+
+        self._num_workers: int = num_workers
+        self._pool: multiprocessing.pool.Pool = multiprocessing.Pool(num_workers)
+
+        # a fixed seed scores every generation on the same course
+        self._seed: int | None = seed
+        self._policy: EvaluationPolicy | None = policy
+        self._skip_frames: bool = skip_frames
+        self._frames: int = 0
+
+    @property
+    def num_workers(self) -> int:
+        return self._num_workers
+
+    @property
+    def frames(self) -> int:
+        """Frames simulated by every worker for the last evaluation"""
+        return self._frames
+
+    def evaluate(self, genomes: list[tuple[int, neat.genome.DefaultGenome]], config: neat.config.Config) -> None:
+        seed: int = Course().seed if self._seed is None else self._seed
+        population: list[neat.genome.DefaultGenome] = [genome for _, genome in genomes]
+
+        # merge the fitness back into the parent's genomes before reproduction
+        (fitnesses,) = self.simulate([(seed, population)], config)
+        for genome, fitness in zip(population, fitnesses):
+            genome.fitness = fitness
+
+    def simulate(self, batches: list[tuple[int, list[neat.genome.DefaultGenome]]],
+                 config: neat.config.Config) -> list[list[float]]:
+        """Fitness of each batch of genomes on its own course seed, every batch sharing the one pool"""
+        total: int = sum(len(population) for _, population in batches)
+        self._frames = 0
+        if total == 0:
+            return [[] for _ in batches]
+
+        shard_count: int = min(total, self._num_workers * self._SHARDS_PER_WORKER)
+        shard_size: int = -(-total // shard_count)
+        shards: list[tuple[int, list[neat.genome.DefaultGenome]]] = [
+            (batch, population[start:start + shard_size])
+            for batch, (_, population) in enumerate(batches)
+            for start in range(0, len(population), shard_size)]
+
+        results: list[tuple[list[float], int]] = self._pool.starmap(
+            simulate_shard, [(shard, config, batches[batch][0], self._policy, self._skip_frames)
+                             for batch, shard in shards])
+
+        fitnesses: list[list[float]] = [[] for _ in batches]
+        for (batch, _), (result, frames) in zip(shards, results):
+            fitnesses[batch].extend(result)
+            self._frames += frames
+
+        return fitnesses
+
+    def close(self) -> None:
+        self._pool.close()
+        self._pool.join()
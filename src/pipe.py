@@ -1,10 +1,11 @@
 from enum import Enum
 
 import pygame
-import random
 import settings
 
+from assets import ASSETS
 from entity import Entity
+from render import Sprites
 
 
 class PipeOrientation(Enum):
@@ -13,38 +14,37 @@ class PipeOrientation(Enum):
 
 
 class Pipe(Entity):
-    _NORMAL_IMG: pygame.Surface = pygame.image.load(
-        settings.ASSETS_PATH / "pipe-green.png")
-    _REVERSE_IMG: pygame.Surface = pygame.transform.flip(
-        _NORMAL_IMG, False, True)
+    __slots__ = ("_orientation",)
 
     def __init__(self, x: float, y: float, orientation: PipeOrientation):
         super().__init__(x, y, settings.PIPE_SIZE.x, settings.PIPE_SIZE.y)
-        self._velocity = settings.PIPE_VELOCITY.copy()
+        self._vx, self._vy = settings.PIPE_VELOCITY
         self._orientation: PipeOrientation = orientation
 
-    def draw(self, display: pygame.Surface):
-        display.blit(
-            Pipe._NORMAL_IMG if self._orientation == PipeOrientation.UP else Pipe._REVERSE_IMG,
-            self._position
-        )
+    def sprites(self) -> Sprites:
+        return [(
+            ASSETS["pipe"] if self._orientation == PipeOrientation.UP else ASSETS["pipe-reversed"],
+            (self._x, self._y)
+        )]
         # pygame.draw.rect(display, (255, 0, 0), self.rect)
 
 
 class Pipes(Entity):
+    # a pair of pipes has no state of its own, everything is read from the top pipe
+    __slots__ = ("_top_pipe", "_bottom_pipe")
+
     _pipe_offset: float = 320.0
 
-    def __init__(self, x: float):
-        start_y: float = -random.choice(settings.PIPE_HEIGHTS)
+    def __init__(self, x: float, height: float):
+        start_y: float = -height
 
         self._top_pipe = Pipe(x, start_y, PipeOrientation.DOWN)
         self._bottom_pipe = Pipe(
             x, start_y + self._pipe_offset + settings.PIPE_GAP, PipeOrientation.UP)
-        self.velocity = settings.PIPE_VELOCITY.copy()
 
     @property
     def velocity(self) -> pygame.Vector2:
-        return self._top_pipe.velocity.copy()
+        return self._top_pipe.velocity
 
     @velocity.setter
     def velocity(self, velocity: pygame.Vector2) -> None:
@@ -53,7 +53,7 @@ class Pipes(Entity):
 
     @property
     def x(self) -> float:
-        return self._top_pipe.x
+        return self._top_pipe._x
 
     @x.setter
     def x(self, x: float) -> None:
@@ -62,13 +62,47 @@ class Pipes(Entity):
 
     @property
     def y(self) -> float:
-        return self._top_pipe.y
+        return self._top_pipe._y
 
     @y.setter
     def y(self, y) -> None:
         self._top_pipe.y = y
         self._bottom_pipe.y = y + self._pipe_offset
 
+    @property
+    def position(self) -> pygame.Vector2:
+        return self._top_pipe.position
+
+    @property
+    def width(self) -> float:
+        return self._top_pipe._width
+
+    @property
+    def height(self) -> float:
+        return self._top_pipe._height
+
+    @property
+    def size(self) -> pygame.Vector2:
+        return self._top_pipe.size
+
+    @property
+    def rect(self) -> pygame.Rect:
+        return self._top_pipe.rect
+
+    @property
+    def vx(self) -> float:
+        return self._top_pipe._vx
+
+    @property
+    def gap_top(self) -> float:
+        # bottom edge of the top pipe
+        return self._top_pipe._y + self._top_pipe._height
+
+    @property
+    def gap_bottom(self) -> float:
+        # top edge of the bottom pipe
+        return self._bottom_pipe._y
+
     @property
     def top_pipe(self) -> Pipe:
         return self._top_pipe
@@ -77,6 +111,10 @@ class Pipes(Entity):
     def bottom_pipe(self) -> Pipe:
         return self._bottom_pipe
 
+    def accelerate(self, dvx: float) -> None:
+        self._top_pipe._vx += dvx
+        self._bottom_pipe._vx += dvx
+
     def update(self, delta: float) -> None:
         self._top_pipe.update(delta)
         self._bottom_pipe.update(delta)
@@ -84,13 +122,5 @@ class Pipes(Entity):
     def collides(self, other: Entity) -> bool:
         return self._top_pipe.collides(other) or self._bottom_pipe.collides(other)
 
-    def draw(self, display: pygame.Surface) -> None:
-        self._top_pipe.draw(display)
-        self._bottom_pipe.draw(display)
-
-    def __getattr__(self, name: str) -> any:
-        if hasattr(self._top_pipe, name):
-            return getattr(self._top_pipe, name)
-
-        raise AttributeError(
-            f"{self.__class__.__name__} has no attribute {name}")
+    def sprites(self) -> Sprites:
+        return [*self._top_pipe.sprites(), *self._bottom_pipe.sprites()]
@@ -0,0 +1,60 @@
+from typing import Callable
+
+import numpy as np
+
+import neat.config
+
+# numpy versions of neat-python's fitness criteria
+_CRITERIA: dict[str, Callable[[np.ndarray], float]] = {
+    "max": np.max,
+    "min": np.min,
+    "mean": np.mean,
+}
+
+
+class EvaluationPolicy:
+    """Decides when a generation can stop being simulated before every bird has died"""
+
+    def __init__(self, *, stop_when_capped: bool = True, stop_when_decided: bool = False,
+                 max_frames: int | None = None):
+        if max_frames is not None and max_frames <= 0:
+            raise ValueError("Max frames must be a positive number")
+
+        # capped birds only ever die without scoring, so stopping for them never changes any fitness
+        self._stop_when_capped: bool = stop_when_capped
+        # the run ends once fitness_threshold is met, the remaining frames only refine the losers
+        self._stop_when_decided: bool = stop_when_decided
+        self._max_frames: int | None = max_frames
+
+    @property
+    def stop_when_capped(self) -> bool:
+        return self._stop_when_capped
+
+    @property
+    def stop_when_decided(self) -> bool:
+        return self._stop_when_decided
+
+    @property
+    def max_frames(self) -> int | None:
+        return self._max_frames
+
+    def finished(self, *, frame: int, fitness: np.ndarray, alive: np.ndarray, cap: float | None,
+                 config: neat.config.Config | None = None, partial: bool = False) -> bool:
+        """Whether the frames simulated so far already settle the generation.
+
+        partial is set when fitness only covers part of the population, as in a worker's shard.
+        """
+        if self._max_frames is not None and frame >= self._max_frames:
+            return True
+
+        if self._stop_when_capped and cap and not np.any(fitness[alive] <= cap):
+            return True
+
+        if self._stop_when_decided and config is not None and not config.no_fitness_termination and len(fitness):
+            # only the best of a shard is enough to decide for the whole population
+            if partial and config.fitness_criterion != "max":
+                return False
+
+            return _CRITERIA[config.fitness_criterion](fitness) >= config.fitness_threshold
+
+        return False
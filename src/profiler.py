@@ -0,0 +1,67 @@
+import csv
+import json
+from pathlib import Path
+
+
+class FrameProfiler:
+    """Accumulates time spent in each phase of Game.run, aggregated per run (a NEAT generation)"""
+
+    # wait is the frame pacing sleep of windowed runs, kept apart from the cost of drawing
+    PHASES: tuple[str, ...] = ("update", "recycle", "collision", "render", "wait", "input")
+
+    def __init__(self):
+        self._runs: list[dict] = []
+        self._current: dict[str, float] | None = None
+        self._frames: int = 0
+
+    @property
+    def runs(self) -> list[dict]:
+        return self._runs
+
+    def start_run(self) -> None:
+        self._current = dict.fromkeys(self.PHASES, 0.0)
+        self._frames = 0
+
+    def frame(self, update: float, recycle: float, collision: float, render: float, wait: float,
+              events: float) -> None:
+        current: dict[str, float] = self._current
+        current["update"] += update
+        current["recycle"] += recycle
+        current["collision"] += collision
+        current["render"] += render
+        current["wait"] += wait
+        current["input"] += events
+        self._frames += 1
+
+    def end_run(self, **fields) -> None:
+        """Closes the current run, storing its phase totals along with any extra fields"""
+        seconds: float = sum(self._current.values())
+        self._runs.append({
+            "run": len(self._runs),
+            **fields,
+            "frames": self._frames,
+            "seconds": seconds,
+            "frames_per_second": self._frames / seconds if seconds else 0.0,
+            **self._current,
+        })
+        self._current = None
+
+    def totals(self) -> dict[str, float]:
+        return {phase: sum(run[phase] for run in self._runs) for phase in ("frames", "seconds", *self.PHASES)}
+
+    def to_json(self, path: Path) -> None:
+        Path(path).write_text(json.dumps({"totals": self.totals(), "runs": self._runs}, indent=2))
+
+    def to_csv(self, path: Path) -> None:
+        with open(path, "w", newline="") as file:
+            writer: csv.DictWriter = csv.DictWriter(
+                file, fieldnames=list(dict.fromkeys(key for run in self._runs for key in run)))
+            writer.writeheader()
+            writer.writerows(self._runs)
+
+    def export(self, path: Path) -> None:
+        # the file extension picks the format
+        if Path(path).suffix.lower() == ".csv":
+            self.to_csv(path)
+        else:
+            self.to_json(path)
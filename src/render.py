@@ -0,0 +1,68 @@
+import pygame
+
+# (image, position) pairs as taken by Surface.blits
+Sprites = list[tuple[pygame.Surface, tuple[float, float]]]
+
+
+class Renderer:
+    """Draws each frame with batched blits and only sends the regions that changed to the display"""
+
+    _TEXT_COLOR: tuple[int, int, int] = (255, 255, 255)
+    _TEXT_POSITION: tuple[int, int] = (30, 10)
+    _LINE_HEIGHT: int = 35
+
+    def __init__(self, screen: pygame.Surface, background: pygame.Surface, font: pygame.font.Font):
+        self._screen: pygame.Surface = screen
+        self._background: pygame.Surface = background
+        self._font: pygame.font.Font = font
+
+        # rendered HUD lines, only rendered again when their text changes
+        self._text: list[tuple[str, pygame.Surface]] = []
+
+        # regions drawn over last frame and this frame, None until a full frame has been shown
+        self._previous: list[pygame.Rect] | None = None
+        self._dirty: list[pygame.Rect] = []
+
+    def invalidate(self) -> None:
+        """Redraws and presents the whole screen on the next frame"""
+        self._previous = None
+
+    def begin(self) -> None:
+        # wipe last frame by restoring the background only where something was drawn
+        if self._previous is None:
+            self._screen.blit(self._background, (0, 0))
+        else:
+            self._screen.blits([(self._background, rect, rect) for rect in self._previous], doreturn=False)
+
+        self._dirty = []
+
+    def draw(self, sprites: Sprites, *, merge: bool = False) -> None:
+        """Blits the sprites in one call, merge marks their bounding box dirty rather than every sprite"""
+        rects: list[pygame.Rect] = self._screen.blits(sprites)
+        if merge and rects:
+            rects = [rects[0].unionall(rects)]
+
+        self._dirty.extend(rects)
+
+    def text(self, lines: list[str]) -> None:
+        del self._text[len(lines):]
+
+        sprites: Sprites = []
+        x, y = self._TEXT_POSITION
+        for index, line in enumerate(lines):
+            if index == len(self._text):
+                self._text.append((line, self._font.render(line, True, self._TEXT_COLOR)))
+            elif self._text[index][0] != line:
+                self._text[index] = (line, self._font.render(line, True, self._TEXT_COLOR))
+
+            sprites.append((self._text[index][1], (x, y + index * self._LINE_HEIGHT)))
+
+        self.draw(sprites)
+
+    def present(self) -> None:
+        if self._previous is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._previous + self._dirty)
+
+        self._previous = self._dirty
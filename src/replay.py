@@ -0,0 +1,74 @@
+import numpy as np
+import pygame
+
+from bird import Bird
+from champion import ChampionGenome
+from clock import SimulationClock
+from episode import Episode
+from neat_game import NeatGame, NeatBird
+
+
+class ReplayGame(NeatGame):
+    """Plays a recorded episode back on its own course, the recorded jumps stand in for the bird's network"""
+
+    def __init__(self, episode: Episode, *, headless: bool, clock: SimulationClock | None = None):
+        if clock is None:
+            clock = SimulationClock(timestep=episode.timestep)
+        if clock.timestep != episode.timestep:
+            raise ValueError("Episodes can only be replayed with the timestep they were recorded with")
+
+        self._episode: Episode = episode
+
+        # start normal game operation on the recorded course
+        super(NeatGame, self).__init__(headless=headless, seed=episode.seed, clock=clock)
+
+    @property
+    def episode(self) -> Episode:
+        return self._episode
+
+    def _gen_birds(self) -> list[Bird]:
+        NeatBird.fitness_threshold = self._episode.cap
+
+        x, y, vx, vy = self._episode.start
+        bird: NeatBird = NeatBird(x, y, ChampionGenome(0, self._episode.fitness))
+        bird.velocity = pygame.Vector2(vx, vy)
+
+        return [bird]
+
+    def _jumps(self) -> np.ndarray:
+        # the frame being decided has already been stepped
+        frame: int = self._simulation_clock.frame - 1
+        if frame + 1 >= self._episode.frames:
+            self._running = False
+
+        return self._episode.jumps[frame:frame + 1]
+
+    def _display_text(self) -> list[str]:
+        return [
+            f"FPS: {round(self._clock.get_fps(), 1)}",
+            f"Frame: {self.frames}/{self._episode.frames}",
+            f"Fit: {self.best_fitness}",
+        ]
+
+    def run(self) -> None:
+        super(NeatGame, self).run()
+
+
+if __name__ == "__main__":
+    import argparse
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Replay a recorded Flappy Bird episode")
+    parser.add_argument("episode", type=Path, help="episode file recorded by neat_game.py --episodes")
+    parser.add_argument("--window", action="store_true", help="watch the replay in a game window")
+    parser.add_argument("--max-speed", action="store_true", help="never throttle drawn frames to real time")
+    args = parser.parse_args()
+
+    episode: Episode = Episode.load(args.episode)
+    clock: SimulationClock = SimulationClock(timestep=episode.timestep, max_speed=args.max_speed)
+
+    with ReplayGame(episode, headless=not args.window, clock=clock) as game:
+        game.run()
+
+        print(f"Replayed {game.frames} of {episode.frames} frames, "
+              f"fitness {game.best_fitness} (recorded {episode.fitness})")
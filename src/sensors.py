@@ -0,0 +1,77 @@
+import numpy as np
+
+from obstacles import ObstaclePool
+from swarm import BirdSwarm
+
+
+def _nearest(head: np.ndarray | int, pipe_x: np.ndarray, x: np.ndarray | float) -> np.ndarray:
+    """Slot of the first pipe whose right edge is still ahead of x, on every row of pipe x positions"""
+    # pipes are passed in the order they sit in the ring from the leftmost one
+    passed: np.ndarray = (pipe_x + ObstaclePool.PIPE_WIDTH <= x).sum(axis=1)
+    return (head + passed) % ObstaclePool.PIPES
+
+
+class PipeSensor:
+    """Builds every bird's network inputs at once from the pipe ahead of its flock.
+
+    The birds of a game fly in one column, so the nearest pipe is the same for all of them and is
+    looked up once per game.
+    """
+
+    # distance to the pipe, to the bottom of the top pipe, to the top of the bottom pipe,
+    # to the ground, the bird's y velocity and the pipe's x velocity
+    INPUTS: int = 6
+
+    def __init__(self, birds: int):
+        self._inputs: np.ndarray = np.empty((birds, self.INPUTS))
+
+    def observe(self, swarm: BirdSwarm, obstacles: ObstaclePool) -> np.ndarray:
+        """Network inputs of every bird in the swarm, one row each, reused by the next call.
+
+        The swarm holds the birds of every game of the obstacles side by side, the same number each.
+        """
+        games: int = obstacles.games
+        x: np.ndarray = swarm.x.reshape(games, -1)
+        y: np.ndarray = swarm.y.reshape(games, -1)
+
+        pipe_x: np.ndarray = obstacles.pipe_x
+        # every game's nearest pipe, counted across the pipe slots of all games laid end to end
+        nearest: np.ndarray = (_nearest(obstacles.head, pipe_x, x[:, :1]) +
+                               np.arange(0, pipe_x.size, obstacles.PIPES))
+        gap_top: np.ndarray = obstacles.top_y.take(nearest) + obstacles.PIPE_HEIGHT
+        gap_bottom: np.ndarray = obstacles.bottom_y.take(nearest)
+
+        inputs: np.ndarray = self._inputs.reshape(games, -1, self.INPUTS)
+        distance: np.ndarray = inputs[:, :, 0]
+        np.abs(np.subtract(pipe_x.take(nearest)[:, np.newaxis], x, out=distance), out=distance)
+        np.subtract(gap_top[:, np.newaxis], y, out=inputs[:, :, 1])
+        np.subtract(gap_bottom[:, np.newaxis], y, out=inputs[:, :, 2])
+        np.subtract(obstacles.ground, y, out=inputs[:, :, 3])
+        inputs[:, :, 4] = swarm.vy.reshape(games, -1)
+        inputs[:, :, 5] = obstacles.vx[:, np.newaxis]
+
+        return self._inputs
+
+    @staticmethod
+    def observe_frames(x: float, y: np.ndarray, vy: np.ndarray, obstacles: ObstaclePool, pipe_x: np.ndarray,
+                       vx: np.ndarray) -> np.ndarray:
+        """observe over several frames of a single game at once, shaped (frames, birds, INPUTS).
+
+        y and vy hold every bird's state on each frame, one row per frame, pipe_x every pipe slot's
+        position on each frame, one column per slot, and vx the pipes' shared velocity on each frame.
+        """
+        # the first pipe whose right edge is still ahead of the flock on each frame
+        nearest: np.ndarray = _nearest(obstacles.head[0], pipe_x, x)
+        frames: np.ndarray = np.arange(len(y))
+        gap_top: np.ndarray = (obstacles.top_y[0] + obstacles.PIPE_HEIGHT)[nearest, np.newaxis]
+        gap_bottom: np.ndarray = obstacles.bottom_y[0][nearest, np.newaxis]
+
+        inputs: np.ndarray = np.empty((*y.shape, PipeSensor.INPUTS))
+        inputs[:, :, 0] = np.abs(pipe_x[frames, nearest] - x)[:, np.newaxis]
+        np.subtract(gap_top, y, out=inputs[:, :, 1])
+        np.subtract(gap_bottom, y, out=inputs[:, :, 2])
+        np.subtract(obstacles.ground, y, out=inputs[:, :, 3])
+        inputs[:, :, 4] = vy
+        inputs[:, :, 5] = vx[:, np.newaxis]
+
+        return inputs
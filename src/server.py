@@ -0,0 +1,348 @@
+import asyncio
+import concurrent.futures
+import itertools
+import os
+import pickle
+import socket
+import stat
+import struct
+import tempfile
+from pathlib import Path
+
+import neat
+import neat.config
+import neat.genome
+
+import settings
+
+from champion import ChampionBundle, ChampionGenome
+from parallel import ShardGame, simulate_shard
+from policy import EvaluationPolicy
+
+# every message is a length prefix followed by a pickled dict
+_LENGTH: struct.Struct = struct.Struct("<I")
+
+_SOCKET_NAME: str = "flappy-bird-neat.sock"
+
+
+def default_socket_path() -> Path:
+    """Socket path in the user's runtime directory, or else in a private directory under the temp directory"""
+    runtime: str | None = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime) / _SOCKET_NAME
+
+    directory: Path = Path(tempfile.gettempdir()) / f"flappy-bird-neat-{os.getuid()}"
+    directory.mkdir(mode=0o700, exist_ok=True)
+
+    # the temp directory is shared, so a directory someone else made in our place can't be trusted
+    status: os.stat_result = directory.lstat()
+    if not stat.S_ISDIR(status.st_mode) or status.st_uid != os.getuid() or status.st_mode & 0o077:
+        raise PermissionError(f"{directory} is not a private directory of this user")
+
+    return directory / _SOCKET_NAME
+
+
+async def _receive(reader: asyncio.StreamReader) -> dict | None:
+    try:
+        (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+        return pickle.loads(await reader.readexactly(length))
+    except asyncio.IncompleteReadError:
+        return None
+
+
+def _send(writer: asyncio.StreamWriter, message: dict) -> None:
+    payload: bytes = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    writer.write(_LENGTH.pack(len(payload)) + payload)
+
+
+def simulate_champions(path: Path, config: neat.config.Config, seed: int,
+                       policy: EvaluationPolicy | None = None) -> tuple[list[float], int]:
+    """Fitness of every champion in a champion file on the seed's course, flown by their saved networks"""
+    with ChampionBundle(path) as bundle:
+        genomes: list[ChampionGenome] = [
+            ChampionGenome(champion["key"], champion["fitness"]) for champion in bundle.champions]
+        game: ShardGame = ShardGame(genomes=genomes, config=config, seed=seed, policy=policy,
+                                    networks=bundle.networks)
+        game.run()
+
+    return [genome.fitness for genome in genomes], game.frames
+
+
+class EvaluationServer:
+    """Scores genomes and champion files sent over a local Unix socket.
+
+    Genome jobs arriving close together for the same course are merged into one population, simulated
+    in one batched step on a process pool, and their fitness split back per job. Messages are pickled,
+    so the socket is only readable by its owner and must not be exposed to anyone untrusted.
+    """
+
+    def __init__(self, path: Path, config: neat.config.Config, *, workers: int = 1, batch_window: float = 0.01,
+                 max_batch: int = 1000, policy: EvaluationPolicy | None = None):
+        if workers <= 0:
+            raise ValueError("Workers must be a positive number")
+        if policy is not None and policy.stop_when_decided:
+            raise ValueError("A job's fitness can't depend on the jobs batched with it, don't stop when decided")
+
+        self._path: Path = Path(path)
+        self._config: neat.config.Config = config
+        self._workers: int = workers
+        self._policy: EvaluationPolicy | None = policy
+
+        # how long, and up to how many genomes, jobs are gathered before a batch is simulated
+        self._batch_window: float = batch_window
+        self._max_batch: int = max_batch
+
+        self._pool: concurrent.futures.ProcessPoolExecutor | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._queue: asyncio.Queue | None = None
+        self._batcher: asyncio.Task | None = None
+        self._simulations: set[asyncio.Task] = set()
+        self._connections: dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+        # jobs and batches simulated so far
+        self.jobs: int = 0
+        self.batches: int = 0
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    async def start(self) -> None:
+        self._pool = concurrent.futures.ProcessPoolExecutor(self._workers)
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self.__batch())
+
+        # only a socket left behind by an earlier server is replaced, never any other file
+        try:
+            if stat.S_ISSOCK(os.stat(self._path).st_mode):
+                self._path.unlink()
+        except FileNotFoundError:
+            pass
+
+        # bound under a umask so the socket is never open to others, not even before a chmod
+        listener: socket.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask: int = os.umask(0o077)
+        try:
+            listener.bind(str(self._path))
+        except BaseException:
+            listener.close()
+            raise
+        finally:
+            os.umask(umask)
+
+        self._server = await asyncio.start_unix_server(self.__connection, sock=listener)
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+
+            # hang up on connected clients and let their handlers wind down
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+
+            await self._server.wait_closed()
+            self._path.unlink(missing_ok=True)
+
+        if self._batcher is not None:
+            self._batcher.cancel()
+
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    async def __aenter__(self) -> "EvaluationServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def __connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection: asyncio.Task = asyncio.current_task()
+        self._connections[connection] = writer
+
+        # requests on one connection are answered as they finish, matched up by their id
+        tasks: set[asyncio.Task] = set()
+        try:
+            while (request := await _receive(reader)) is not None:
+                task: asyncio.Task = asyncio.create_task(self.__answer(request, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            await asyncio.gather(*tasks)
+        finally:
+            del self._connections[connection]
+            writer.close()
+
+    async def __answer(self, request: dict, writer: asyncio.StreamWriter) -> None:
+        try:
+            seed: int = settings.COURSE_SEED if request.get("seed") is None else request["seed"]
+            if "champion" in request:
+                fitnesses, _ = await asyncio.get_running_loop().run_in_executor(
+                    self._pool, simulate_champions, request["champion"], self._config, seed, self._policy)
+            else:
+                fitnesses = await self.evaluate(request["genomes"], seed)
+
+            response: dict = {"id": request["id"], "fitness": fitnesses}
+        except Exception as error:
+            response = {"id": request.get("id"), "error": f"{type(error).__name__}: {error}"}
+
+        # the client may have hung up while its job ran
+        if not writer.is_closing():
+            _send(writer, response)
+            await writer.drain()
+
+    async def evaluate(self, genomes: list[neat.genome.DefaultGenome], seed: int) -> list[float]:
+        """Fitness of the genomes on the seed's course, simulated along with any jobs queued at the same time"""
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put((seed, genomes, future))
+
+        return await future
+
+    async def __batch(self) -> None:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        while True:
+            # wait for a job, then give others a moment to join it
+            jobs: list[tuple[int, list, asyncio.Future]] = [await self._queue.get()]
+            deadline: float = loop.time() + self._batch_window
+            size: int = len(jobs[0][1])
+            while size < self._max_batch:
+                try:
+                    jobs.append(await asyncio.wait_for(self._queue.get(), deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+                size += len(jobs[-1][1])
+
+            # jobs only share a simulation when they fly the same course
+            for seed, group in itertools.groupby(sorted(jobs, key=lambda job: job[0]), key=lambda job: job[0]):
+                task: asyncio.Task = asyncio.create_task(self.__simulate(seed, list(group)))
+                self._simulations.add(task)
+                task.add_done_callback(self._simulations.discard)
+
+    async def __simulate(self, seed: int, jobs: list[tuple[int, list, asyncio.Future]]) -> None:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        population: list[neat.genome.DefaultGenome] = [genome for _, genomes, _ in jobs for genome in genomes]
+        self.jobs += len(jobs)
+        self.batches += 1
+
+        # one shard per worker, each a single vectorized population step
+        shard_size: int = max(1, -(-len(population) // self._workers))
+        try:
+            results: list[tuple[list[float], int]] = await asyncio.gather(*(
+                loop.run_in_executor(self._pool, simulate_shard, population[start:start + shard_size],
+                                     self._config, seed, self._policy)
+                for start in range(0, len(population), shard_size)))
+        except Exception as error:
+            for _, _, future in jobs:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        fitnesses: list[float] = [fitness for shard, _ in results for fitness in shard]
+        start: int = 0
+        for _, genomes, future in jobs:
+            if not future.done():
+                future.set_result(fitnesses[start:start + len(genomes)])
+            start += len(genomes)
+
+
+class EvaluationClient:
+    """Submits jobs to an EvaluationServer, requests may be sent concurrently over the one connection"""
+
+    def __init__(self, path: Path | None = None):
+        self._path: Path = Path(path) if path is not None else default_socket_path()
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._listener: asyncio.Task | None = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._ids: itertools.count = itertools.count()
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_unix_connection(str(self._path))
+        self._listener = asyncio.create_task(self.__listen())
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+
+        if self._listener is not None:
+            await self._listener
+
+    async def __aenter__(self) -> "EvaluationClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def __listen(self) -> None:
+        while (response := await _receive(self._reader)) is not None:
+            future: asyncio.Future = self._pending.pop(response["id"])
+            if "error" in response:
+                future.set_exception(RuntimeError(response["error"]))
+            else:
+                future.set_result(response["fitness"])
+
+        # the server went away, nothing still waiting will be answered
+        for future in self._pending.values():
+            future.set_exception(ConnectionError("Evaluation server closed the connection"))
+        self._pending.clear()
+
+    async def __request(self, request: dict) -> list[float]:
+        request["id"] = next(self._ids)
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending[request["id"]] = future
+
+        _send(self._writer, request)
+        await self._writer.drain()
+
+        return await future
+
+    async def evaluate(self, genomes: list[neat.genome.DefaultGenome], *, seed: int | None = None) -> list[float]:
+        """Fitness of each genome on the seed's course, settings.COURSE_SEED if no seed is given"""
+        return await self.__request({"genomes": genomes, "seed": seed})
+
+    async def evaluate_champions(self, path: Path, *, seed: int | None = None) -> list[float]:
+        """Fitness of each champion in a champion file readable by the server"""
+        return await self.__request({"champion": str(Path(path).resolve()), "seed": seed})
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from speciation import VectorSpeciesSet
+
+    parser = argparse.ArgumentParser(description="Serve Flappy Bird genome evaluations over a local socket")
+    parser.add_argument("--socket", type=Path, default=None,
+                        help="Unix socket path to listen on, by default in the user's runtime directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="number of processes simulating batches")
+    parser.add_argument("--batch-window", type=float, default=0.01,
+                        help="seconds jobs are gathered into one batch")
+    parser.add_argument("--max-frames", type=int, default=None,
+                        help="simulate at most this many frames per job")
+    args = parser.parse_args()
+
+    config: neat.config.Config = neat.config.Config(
+        neat.DefaultGenome,
+        neat.DefaultReproduction,
+        VectorSpeciesSet,
+        neat.DefaultStagnation,
+        Path(__file__).parent.resolve() / "neat-config.cfg"
+    )
+
+    async def serve() -> None:
+        path: Path = args.socket if args.socket is not None else default_socket_path()
+        async with EvaluationServer(path, config, workers=args.workers, batch_window=args.batch_window,
+                                    policy=EvaluationPolicy(max_frames=args.max_frames)) as server:
+            print(f"Serving evaluations on {server.path}")
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
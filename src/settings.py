@@ -36,3 +36,6 @@ BASE_VELOCITY: pygame.Vector2 = PIPE_VELOCITY.copy()
 
 # neat controls
 NEAT_THRESHOLD: float = 0.9
+
+# pipe course every parallel worker shares when no seed is given
+COURSE_SEED: int = 0
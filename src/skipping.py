@@ -0,0 +1,161 @@
+from typing import Callable
+
+import numpy as np
+
+import settings
+
+from collision import Edges, collides, rect_edges
+from obstacles import ObstaclePool
+from swarm import BirdSwarm
+
+
+def _integrate(start: np.ndarray, steps: np.ndarray | float, frames: int) -> np.ndarray:
+    """Rows of start after 0 to frames additions of steps, added one frame at a time like the frame loop does"""
+    rows: np.ndarray = np.empty((frames + 1, len(start)))
+    rows[0] = start
+    rows[1:] = steps
+
+    # accumulate adds strictly in order, so every row rounds exactly as the frame loop would
+    return np.add.accumulate(rows, axis=0, out=rows)
+
+
+class FrameSkipper:
+    """Carries the game over the frames between jumps in one batched step.
+
+    Until a bird jumps, birds, pipes and ground only follow their physics, so a window of frames ahead
+    is stepped with the same float operations as the frame loop, just every frame at once. The networks
+    are asked about the whole window in one pass too, and the window ends before the first frame where
+    anything but physics happens: a bird jumps, a pipe is recycled or a bird reaches terminal velocity.
+    Deaths, fitness and the evaluation policy are still settled frame by frame by the game.
+    """
+
+    # frames looked ahead, grown while windows run their full length and shrunk when jumps cut them short
+    MIN_HORIZON: int = 8
+    MAX_HORIZON: int = 256
+
+    def __init__(self, timestep: float):
+        self._dt: float = timestep
+        self._horizon: int = self.MIN_HORIZON
+
+    def advance(self, swarm: BirdSwarm, obstacles: ObstaclePool,
+                forecast: Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray], np.ndarray],
+                frame: Callable[[np.ndarray], bool]) -> int:
+        """Simulates the frames up to the next jump, returns how many were simulated.
+
+        forecast is given every bird's y and y velocity, every pipe slot's x and the pipes' shared x velocity
+        on each frame of the window, one row per frame, and returns which birds their networks would jump
+        on each of them.
+        frame is called after each frame's collisions with that frame's forecast, for the game to finish
+        the frame, and ends the window early when it returns True.
+        """
+        dt: float = self._dt
+        slots: np.ndarray = np.flatnonzero(swarm.alive)
+
+        # the flock has to share one column, as the sensors expect
+        if len(slots) == 0 or settings.GRAVITY.x != 0 or np.any(swarm.vx[slots]):
+            return 0
+
+        # terminal velocity is snapped to rather than integrated, leave it to the frame loop
+        vy: np.ndarray = _integrate(swarm.vy[slots], settings.GRAVITY.y * dt, self._horizon)
+        terminal: np.ndarray = np.any(vy[1:] > settings.TERMINAL_VELOCITY.y, axis=1)
+        frames: int = int(np.argmax(terminal)) if terminal.any() else self._horizon
+
+        # nor may a pipe be recycled within the window
+        scroll, vx, pipe_x, ground_scroll, base_world, base_x = self.__obstacles(obstacles, frames)
+        frames = len(base_x) - 1
+        if frames == 0:
+            return 0
+
+        vy = vy[:frames + 1]
+        y: np.ndarray = _integrate(swarm.y[slots], vy[:-1] * dt, frames)
+        jump_counter: np.ndarray = _integrate(swarm.jump_counter[slots], dt, frames)
+        hits: np.ndarray = self.__collisions(swarm, slots, y, obstacles, pipe_x, base_x)
+
+        # dead birds keep still, the networks are asked about every bird like on any other frame
+        flock_y: np.ndarray = np.repeat(swarm.y[np.newaxis], frames, axis=0)
+        flock_vy: np.ndarray = np.repeat(swarm.vy[np.newaxis], frames, axis=0)
+        flock_y[:, slots] = y[1:]
+        flock_vy[:, slots] = vy[1:]
+        jumps: np.ndarray = forecast(flock_y, flock_vy, pipe_x[1:], vx[1:])
+
+        # the window ends before the first frame a bird still flying is able to jump and wants to
+        flying: np.ndarray = ~np.logical_or.accumulate(hits[1:], axis=0)
+        wanted: np.ndarray = np.any(
+            jumps[:, slots] & (jump_counter[1:] >= settings.JUMP_DELAY) & flying, axis=1)
+        window: int = int(np.argmax(wanted)) if wanted.any() else frames
+        self._horizon = min(max(2 * window, self.MIN_HORIZON), self.MAX_HORIZON)
+        if window == 0:
+            return 0
+
+        # settle each frame in order, a dead bird stays where it died
+        last: np.ndarray = np.full(len(slots), window)
+        alive: np.ndarray = swarm.alive
+        killed: np.ndarray = np.zeros(len(swarm), np.bool_)
+        simulated: int = window
+        for index in range(1, window + 1):
+            killed[slots] = hits[index]
+            swarm.kill(killed)
+
+            stop: bool = frame(jumps[index - 1])
+            last[~alive[slots] & (last == window)] = index
+            if stop or not alive.any():
+                simulated = index
+                break
+
+        last = np.minimum(last, simulated)
+        columns: np.ndarray = np.arange(len(slots))
+        swarm.y[slots] = y[last, columns]
+        swarm.vy[slots] = vy[last, columns]
+        swarm.rotation[slots] = np.clip(np.divide(swarm.vy[slots], -3), -90.0, 35.0)
+        swarm.frame_counter[slots] = _integrate(swarm.frame_counter[slots], 5 * dt, simulated)[last, columns]
+        swarm.jump_counter[slots] = jump_counter[last, columns]
+
+        obstacles.move(scroll=float(scroll[simulated]), vx=float(vx[simulated]),
+                       ground_scroll=float(ground_scroll[simulated]), base_world=base_world[simulated])
+
+        return simulated
+
+    def __obstacles(self, obstacles: ObstaclePool, frames: int) -> tuple[np.ndarray, ...]:
+        """Pipe and ground scroll and positions on every frame of the window, cut short before a pipe is
+        recycled: the pipe scroll, velocity and slot positions, then the ground scroll, world positions and
+        screen positions"""
+        dt: float = self._dt
+
+        # ObstaclePool.update then ObstaclePool.recycle's acceleration, the same operations as each frame
+        vx: np.ndarray = _integrate(obstacles.vx, settings.PIPE_ACCELERATION.x, frames)[:, 0]
+        scroll: np.ndarray = _integrate(obstacles.scroll, vx[:-1, np.newaxis] * dt, frames)[:, 0]
+        pipe_x: np.ndarray = obstacles.pipe_world + scroll[:, np.newaxis]
+        recycled: np.ndarray = np.any(pipe_x[1:] + obstacles.PIPE_WIDTH <= 0, axis=1)
+        if recycled.any():
+            frames = int(np.argmax(recycled))
+            vx, scroll, pipe_x = vx[:frames + 1], scroll[:frames + 1], pipe_x[:frames + 1]
+
+        # ground that leaves the screen wraps back around, on the frame it leaves and from then on
+        ground_scroll: np.ndarray = _integrate(
+            obstacles.ground_scroll, obstacles.ground_vx * dt, frames)[:, 0]
+        base_world: np.ndarray = np.repeat(obstacles.base_world, frames + 1, axis=0)
+        base_x: np.ndarray = base_world + ground_scroll[:, np.newaxis]
+        for column in range(obstacles.BASES):
+            row: int = 1
+            while (wrapped := np.flatnonzero(base_x[row:, column] + obstacles.BASE_WIDTH <= 0)).size:
+                row += int(wrapped[0])
+                base_world[row:, column] += settings.SCREEN_SIZE.x + obstacles.BASE_WIDTH
+                base_x[row:, column] = base_world[row:, column] + ground_scroll[row:]
+                row += 1
+
+        return scroll, vx, pipe_x, ground_scroll, base_world, base_x
+
+    @staticmethod
+    def __collisions(swarm: BirdSwarm, slots: np.ndarray, y: np.ndarray, obstacles: ObstaclePool,
+                     pipe_x: np.ndarray, base_x: np.ndarray) -> np.ndarray:
+        """Which birds collision.kill_mask would kill on every frame of the window, one row per frame"""
+        # touching the top of the screen kills regardless of collisions
+        hits: np.ndarray = y <= 0
+
+        # every bird against every obstacle rect, on every frame at once
+        birds: Edges = rect_edges(swarm.x[np.newaxis, slots], y, swarm.width[slots], swarm.height[slots])
+        rects: Edges = obstacles.edges(pipe_x, base_x)
+        hits |= collides(tuple(edge[:, :, np.newaxis] for edge in birds),
+                         tuple(edge[:, np.newaxis] for edge in rects)).any(axis=2)
+
+        return hits
@@ -0,0 +1,293 @@
+from operator import attrgetter
+from typing import Callable
+
+import numpy as np
+
+import neat
+import neat.genome
+from neat.math_util import mean, stdev
+from neat.species import Species
+
+
+class _GeneTable:
+    """One kind of gene of a whole population, flattened into arrays sorted by genome and then gene key.
+
+    Gene keys are numbered in the order they are first seen, so genome row r's gene with key number c
+    sits at r * stride + c of the sorted keys.
+    """
+
+    def __init__(self, genes: list[dict], numbers: tuple[str, ...], names: tuple[str, ...], labels: dict[str, int]):
+        self._numbers: list[Callable] = [attrgetter(number) for number in numbers]
+        self._names: list[Callable] = [attrgetter(name) for name in names]
+        self._labels: dict[str, int] = labels
+
+        keys: list = []
+        flat: list = []
+        for genome_genes in genes:
+            keys.extend(genome_genes)
+            flat.extend(genome_genes.values())
+
+        self._codes: dict = {key: code for code, key in enumerate(dict.fromkeys(keys))}
+        codes: np.ndarray = np.fromiter(map(self._codes.__getitem__, keys), np.int64, len(keys))
+        self.counts: np.ndarray = np.array([len(genome_genes) for genome_genes in genes], np.int64)
+        rows: np.ndarray = np.repeat(np.arange(len(genes)), self.counts)
+
+        # the last code stands for keys no genome has
+        self._missing: int = len(self._codes)
+        self._stride: int = len(self._codes) + 1
+        combined: np.ndarray = rows * self._stride + codes
+        order: np.ndarray = np.argsort(combined)
+        self._keys: np.ndarray = combined[order]
+        self._values: np.ndarray = self.__attributes(flat)[order]
+
+    def __attributes(self, genes: list) -> np.ndarray:
+        """One row per gene holding its numbers, then its names as labels that only need to compare equal"""
+        columns: list[np.ndarray] = [np.fromiter(map(number, genes), np.float64, len(genes))
+                                     for number in self._numbers]
+        for name in self._names:
+            values: list[str] = list(map(name, genes))
+            for label in set(values):
+                self._labels.setdefault(label, len(self._labels))
+            columns.append(np.fromiter(map(self._labels.__getitem__, values), np.float64, len(genes)))
+
+        return np.stack(columns, axis=1)
+
+    def lookup(self, genes: dict, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Which of the genes each genome in rows has and their attributes, one row per genome, one column
+        per gene in dict order and one layer per attribute, then the genes' own attributes"""
+        own: np.ndarray = self.__attributes(list(genes.values()))
+        codes: np.ndarray = np.array([self._codes.get(key, self._missing) for key in genes], np.int64)
+        queries: np.ndarray = rows[:, np.newaxis] * self._stride + codes
+
+        if len(self._keys) == 0:
+            return np.zeros(queries.shape, np.bool_), np.zeros((*queries.shape, own.shape[1])), own
+
+        positions: np.ndarray = np.minimum(np.searchsorted(self._keys, queries), len(self._keys) - 1)
+        return self._keys[positions] == queries, self._values[positions], own
+
+
+class _PopulationTable:
+    """Every genome of a population as sorted gene key arrays, to measure many compatibility distances at once"""
+
+    def __init__(self, population: dict[int, neat.genome.DefaultGenome], genome_config):
+        self._config = genome_config
+        self.rows: dict[int, int] = {key: row for row, key in enumerate(population)}
+
+        genomes: list[neat.genome.DefaultGenome] = list(population.values())
+        labels: dict[str, int] = {}
+        self._nodes: _GeneTable = _GeneTable(
+            [genome.nodes for genome in genomes], ("bias", "response"), ("activation", "aggregation"), labels)
+        self._connections: _GeneTable = _GeneTable(
+            [genome.connections for genome in genomes], ("weight", "enabled"), (), labels)
+
+    def distances(self, genome: neat.genome.DefaultGenome, rows: np.ndarray) -> np.ndarray:
+        """genome.distance to the genome in each row, rounded exactly as DefaultGenome.distance rounds it"""
+        weight_coefficient: float = self._config.compatibility_weight_coefficient
+
+        # the same operations as DefaultNodeGene.distance and DefaultConnectionGene.distance
+        present, values, own = self._nodes.lookup(genome.nodes, rows)
+        gene_distances: np.ndarray = np.abs(own[:, 0] - values[..., 0]) + np.abs(own[:, 1] - values[..., 1])
+        gene_distances += own[:, 2] != values[..., 2]
+        gene_distances += own[:, 3] != values[..., 3]
+        gene_distances *= weight_coefficient
+        node_distances: np.ndarray = self.__combine(present, gene_distances, self._nodes.counts[rows])
+
+        present, values, own = self._connections.lookup(genome.connections, rows)
+        gene_distances = np.abs(own[:, 0] - values[..., 0])
+        gene_distances += own[:, 1] != values[..., 1]
+        gene_distances *= weight_coefficient
+        connection_distances: np.ndarray = self.__combine(present, gene_distances, self._connections.counts[rows])
+
+        return node_distances + connection_distances
+
+    def __combine(self, present: np.ndarray, gene_distances: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Homologous gene distances and disjoint genes into one part of the compatibility distance"""
+        genes: int = present.shape[1]
+        if genes == 0:
+            total: np.ndarray = np.zeros(len(counts))
+        else:
+            # accumulate adds strictly in order, the same order DefaultGenome.distance walks the genes
+            gene_distances[~present] = 0.0
+            total = np.add.accumulate(gene_distances, axis=1)[:, -1]
+
+        homologous: np.ndarray = present.sum(axis=1)
+        disjoint: np.ndarray = (counts - homologous) + (genes - homologous)
+        largest: np.ndarray = np.maximum(counts, genes)
+
+        # genomes without any genes of this kind are no distance apart
+        return np.where(largest > 0, (total + self._config.compatibility_disjoint_coefficient * disjoint) /
+                        np.maximum(largest, 1), 0.0)
+
+
+class VectorSpeciesSet(neat.DefaultSpeciesSet):
+    """DefaultSpeciesSet measuring compatibility distances to representatives in batches.
+
+    Speciation walks the population exactly like DefaultSpeciesSet, but the distances from a representative
+    to every genome it will be compared with are measured at once over sorted gene key arrays, and
+    distances to genomes that survive into the next generation unchanged are remembered. The species,
+    their members and the reported genetic distances come out the same.
+    """
+
+    def __init__(self, config, reporters):
+        super().__init__(config, reporters)
+        # representative key to the distance from it to each genome key, genomes never change under a key
+        self._known: dict[int, dict[int, float]] = {}
+
+    def speciate(self, config, population, generation):
+        assert isinstance(population, dict)
+
+        compatibility_threshold: float = self.species_set_config.compatibility_threshold
+        table: _PopulationTable = _PopulationTable(population, config.genome_config)
+        measured: dict[int, dict[int, float]] = {}
+
+        def measure(representative: neat.genome.DefaultGenome, keys: list[int]) -> np.ndarray:
+            """Distances from the representative to each of the genomes, measured in one batch"""
+            rows: np.ndarray = np.fromiter(map(table.rows.__getitem__, keys), np.int64, len(keys))
+            known: dict[int, float] | None = self._known.get(representative.key)
+            if known is None:
+                distances: np.ndarray = table.distances(representative, rows)
+            else:
+                distances = np.fromiter((known.get(key, np.nan) for key in keys), np.float64, len(keys))
+                unknown: np.ndarray = np.isnan(distances)
+                if unknown.any():
+                    distances[unknown] = table.distances(representative, rows[unknown])
+
+            measured.setdefault(representative.key, {}).update(zip(keys, distances.tolist()))
+            return distances
+
+        # GenomeDistanceCache keeps both orientations of a pair, so a representative of last generation still
+        # in the population answers for pairs already measured from the other end, see __cached
+        stored: list[np.ndarray] = []
+        cached: dict[int, dict[int, float]] = {}
+
+        # the closest genome to each old representative represents its species now
+        # a set built from a dict is sized differently than from its keys, and pops in another order
+        unspeciated: set[int] = set(population.keys())
+        new_representatives: dict[int, int] = {}
+        new_members: dict[int, list[int]] = {}
+        for sid, s in self.species.items():
+            keys: list[int] = list(unspeciated)
+            distances: np.ndarray = measure(s.representative, keys)
+            hits: np.ndarray = self.__cached(cached, s.representative.key, keys, distances)
+
+            # a genome compared with itself is stored once
+            stored.append(np.repeat(distances[~hits], np.where(np.array(keys)[~hits] == s.representative.key, 1, 2)))
+            cached[s.representative.key] = dict(zip(keys, distances.tolist()))
+
+            new_rid: int = keys[int(np.argmin(distances))]
+            new_representatives[sid] = new_rid
+            new_members[sid] = [new_rid]
+            unspeciated.remove(new_rid)
+
+        # the rest in the order DefaultSpeciesSet pops them
+        order: list[int] = []
+        while unspeciated:
+            order.append(unspeciated.pop())
+
+        # one row per representative and one column per genome, rows of species founded on the way
+        # only hold the genomes after their founder
+        sids: list[int] = list(new_representatives)
+        matrix: list[np.ndarray] = []
+        hit_rows: list[np.ndarray] = []
+        founded: list[int] = []
+
+        def compare(rid: int, start: int) -> np.ndarray:
+            distances: np.ndarray = np.full(len(order), np.inf)
+            hits: np.ndarray = np.zeros(len(order), np.bool_)
+            distances[start:] = measure(population[rid], order[start:])
+            hits[start:] = self.__cached(cached, rid, order[start:], distances[start:])
+
+            matrix.append(distances)
+            hit_rows.append(hits)
+            founded.append(start)
+            return distances
+
+        for rid in new_representatives.values():
+            compare(rid, 0)
+
+        # the first representative in dict order with the smallest distance under the threshold
+        nearest: np.ndarray = np.full(len(order), np.inf)
+        closest: np.ndarray = np.zeros(len(order), np.int64)
+        if matrix:
+            distances: np.ndarray = np.array(matrix)
+            close: np.ndarray = distances < compatibility_threshold
+            closest = np.argmin(np.where(close, distances, np.inf), axis=0)
+            nearest = np.where(close, distances, np.inf).min(axis=0)
+        matched: np.ndarray = nearest < np.inf
+
+        # genomes close to no species found new ones, which only the genomes after them may join
+        founders: dict[int, int] = {}
+        start: int = 0
+        while not matched[start:].all():
+            founder: int = start + int(np.argmax(~matched[start:]))
+            sid: int = next(self.indexer)
+            sids.append(sid)
+            new_representatives[sid] = order[founder]
+            new_members[sid] = [order[founder]]
+            founders[founder] = sid
+
+            row: np.ndarray = compare(order[founder], founder + 1)
+            joins: np.ndarray = (row < compatibility_threshold) & (row < nearest)
+            closest[joins] = len(sids) - 1
+            nearest[joins] = row[joins]
+            matched |= joins
+            start = founder + 1
+
+        for column, gid in enumerate(order):
+            if column not in founders:
+                new_members[sids[closest[column]]].append(gid)
+
+        # each genome is compared with the representatives there are by then, in dict order
+        distances = np.array(matrix).reshape(len(matrix), len(order))
+        asked: np.ndarray = (np.arange(len(order)) >= np.array(founded, np.int64)[:, np.newaxis]) & \
+            ~np.array(hit_rows).reshape(distances.shape)
+        stored.append(np.repeat(distances.T[asked.T], 2))
+
+        self.genome_to_species = {}
+        for sid, rid in new_representatives.items():
+            s: Species | None = self.species.get(sid)
+            if s is None:
+                s = Species(sid, generation)
+                self.species[sid] = s
+
+            members: list[int] = new_members[sid]
+            for gid in members:
+                self.genome_to_species[gid] = sid
+
+            s.update(population[rid], {gid: population[gid] for gid in members})
+
+        # only today's representatives are asked about again, and only about genomes that may survive
+        self._known = {rid: measured[rid] for rid in new_representatives.values()}
+
+        values: list[float] = np.concatenate(stored).tolist()
+        self.reporters.info(f"Mean genetic distance {mean(values):.3f}, standard deviation {stdev(values):.3f}")
+
+    @staticmethod
+    def __cached(cached: dict[int, dict[int, float]], key: int, keys: list[int], distances: np.ndarray) -> np.ndarray:
+        """Marks which of the distances from genome key to the genomes were measured before from either end,
+        and puts the distance stored then in their place.
+
+        Only last generation's representatives are measured against the population before today's
+        representatives, so every earlier pair has one of them at one end.
+        """
+        hits: np.ndarray = np.zeros(len(keys), np.bool_)
+        if not cached:
+            return hits
+
+        if key in cached:
+            own: dict[int, float] = cached[key]
+            columns: np.ndarray = np.arange(len(keys))
+        else:
+            own = {}
+            columns = np.flatnonzero(np.isin(np.array(keys, np.int64), np.array(list(cached), np.int64)))
+
+        for column in columns.tolist():
+            other: int = keys[column]
+            d: float | None = own.get(other)
+            if d is None and other in cached:
+                d = cached[other].get(key)
+            if d is not None:
+                hits[column] = True
+                distances[column] = d
+
+        return hits
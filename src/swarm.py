@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+import settings
+
+from assets import ASSETS, BIRD_FRAMES
+from render import Sprites
+
+if TYPE_CHECKING:
+    from bird import Bird
+
+
+class BirdSwarm:
+    """Struct-of-arrays state for a whole population of birds, stepped in one batched update"""
+
+    def __init__(self, birds: list[Bird]):
+        count: int = len(birds)
+
+        self._x: np.ndarray = np.fromiter((bird.x for bird in birds), np.float64, count)
+        self._y: np.ndarray = np.fromiter((bird.y for bird in birds), np.float64, count)
+        self._vx: np.ndarray = np.fromiter((bird.velocity.x for bird in birds), np.float64, count)
+        self._vy: np.ndarray = np.fromiter((bird.velocity.y for bird in birds), np.float64, count)
+        self._width: np.ndarray = np.fromiter((bird.width for bird in birds), np.float64, count)
+        self._height: np.ndarray = np.fromiter((bird.height for bird in birds), np.float64, count)
+
+        self._rotation: np.ndarray = np.fromiter((bird.rotation for bird in birds), np.float64, count)
+        self._frame_counter: np.ndarray = np.fromiter(
+            (bird._frame_counter for bird in birds), np.float64, count)
+        self._jump_counter: np.ndarray = np.fromiter(
+            (bird._jump_counter for bird in birds), np.float64, count)
+        self._alive: np.ndarray = np.fromiter((bird.is_alive for bird in birds), np.bool_, count)
+
+        # scratch buffers reused every frame
+        self._mask: np.ndarray = np.empty(count, np.bool_)
+        self._scratch: np.ndarray = np.empty(count, np.float64)
+
+        # birds become thin views into these arrays
+        for slot, bird in enumerate(birds):
+            bird._attach(self, slot)
+
+    def __len__(self) -> int:
+        return len(self._alive)
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._x
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._y
+
+    @property
+    def vx(self) -> np.ndarray:
+        return self._vx
+
+    @property
+    def vy(self) -> np.ndarray:
+        return self._vy
+
+    @property
+    def width(self) -> np.ndarray:
+        return self._width
+
+    @property
+    def height(self) -> np.ndarray:
+        return self._height
+
+    @property
+    def rotation(self) -> np.ndarray:
+        return self._rotation
+
+    @property
+    def frame_counter(self) -> np.ndarray:
+        return self._frame_counter
+
+    @property
+    def jump_counter(self) -> np.ndarray:
+        return self._jump_counter
+
+    @property
+    def alive(self) -> np.ndarray:
+        return self._alive
+
+    @property
+    def alive_count(self) -> int:
+        return int(np.count_nonzero(self._alive))
+
+    def kill(self, mask: np.ndarray) -> None:
+        self._alive &= ~mask
+
+    def jump(self, mask: np.ndarray | None = None) -> None:
+        # only living birds past their jump delay may jump, same as Bird.jump
+        eligible: np.ndarray = np.greater_equal(
+            self._jump_counter, settings.JUMP_DELAY, out=self._mask)
+        eligible &= self._alive
+        if mask is not None:
+            eligible &= mask
+
+        self._vx[eligible] = settings.JUMP_VELOCITY.x
+        self._vy[eligible] = settings.JUMP_VELOCITY.y
+        self._jump_counter[eligible] = 0.0
+
+    def update(self, delta: float) -> None:
+        """Mirrors Bird.update for every living bird at once"""
+        alive: np.ndarray = self._alive
+
+        # move by the current velocity
+        np.multiply(self._vx, delta, out=self._scratch)
+        np.add(self._x, self._scratch, out=self._x, where=alive)
+        np.multiply(self._vy, delta, out=self._scratch)
+        np.add(self._y, self._scratch, out=self._y, where=alive)
+
+        # apply gravity, snapping to terminal velocity once it is exceeded
+        np.add(self._vx, settings.GRAVITY.x * delta, out=self._vx, where=alive)
+        np.add(self._vy, settings.GRAVITY.y * delta, out=self._vy, where=alive)
+        terminal: np.ndarray = np.greater(
+            self._vy, settings.TERMINAL_VELOCITY.y, out=self._mask)
+        terminal &= alive
+        self._vx[terminal] = settings.TERMINAL_VELOCITY.x
+        self._vy[terminal] = settings.TERMINAL_VELOCITY.y
+
+        # rotation is a proportion of the y velocity clamped to a [-90, 35] range
+        np.divide(self._vy, -3, out=self._scratch)
+        np.clip(self._scratch, -90.0, 35.0, out=self._scratch)
+        np.copyto(self._rotation, self._scratch, where=alive)
+
+        np.add(self._frame_counter, 5 * delta, out=self._frame_counter, where=alive)
+        np.add(self._jump_counter, delta, out=self._jump_counter, where=alive)
+
+    def sprites(self) -> Sprites:
+        """Mirrors Bird.sprites for every living bird at once"""
+        alive: np.ndarray = np.flatnonzero(self._alive)
+        frames: list[int] = np.floor(self._frame_counter[alive] % len(BIRD_FRAMES)).astype(np.intp).tolist()
+
+        return [(ASSETS.rotated(BIRD_FRAMES[frame], rotation), (x, y)) for frame, rotation, x, y in zip(
+            frames, self._rotation[alive].tolist(), self._x[alive].tolist(), self._y[alive].tolist())]
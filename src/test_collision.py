@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+
+import settings
+
+from base import Base
+from bird import Bird
+from collision import Edges, entity_edges, kill_mask
+from course import Course
+from entity import Entity
+from obstacles import ObstaclePool
+from pipe import Pipes
+from swarm import BirdSwarm
+
+
+def _rects(edges: Edges, game: int = 0) -> list[tuple[float, ...]]:
+    return sorted(zip(*(edge[game].tolist() for edge in edges)))
+
+
+def test_kill_mask_matches_colliderect():
+    generator: random.Random = random.Random(0)
+
+    for trial in range(200):
+        birds: list[Bird] = [Bird(generator.uniform(-50.0, 550.0), generator.uniform(-50.0, 550.0))
+                             for _ in range(generator.randint(1, 50))]
+        for bird in birds:
+            if generator.random() < 0.2:
+                bird.kill()
+
+        obstacles: list[Entity] = [Pipes(generator.uniform(-60.0, 550.0), generator.choice(settings.PIPE_HEIGHTS))
+                                   for _ in range(2)]
+        obstacles += [Base(generator.uniform(-400.0, 600.0)) for _ in range(2)]
+
+        expected: list[bool] = [
+            any(bird.is_alive and obstacle.collides(bird) for obstacle in obstacles) or bird.y <= 0
+            for bird in birds]
+        actual: np.ndarray = kill_mask(BirdSwarm(birds), entity_edges(obstacles))
+
+        assert actual.tolist() == expected, f"collision mismatch on trial {trial}"
+
+
+def test_kill_mask_checks_each_game_against_its_own_obstacles():
+    generator: random.Random = random.Random(1)
+
+    for trial in range(50):
+        games: list[tuple[list[Bird], list[Entity]]] = []
+        for _ in range(4):
+            birds: list[Bird] = [Bird(generator.uniform(-50.0, 550.0), generator.uniform(-50.0, 550.0))
+                                 for _ in range(5)]
+            obstacles: list[Entity] = [Pipes(generator.uniform(-60.0, 550.0), generator.choice(settings.PIPE_HEIGHTS))
+                                       for _ in range(2)]
+            games.append((birds, obstacles + [Base(generator.uniform(-400.0, 600.0))]))
+
+        # every game on its own, then all of them side by side with one row of edges each
+        expected: list[bool] = [killed for birds, obstacles in games
+                                for killed in kill_mask(BirdSwarm(birds), entity_edges(obstacles)).tolist()]
+        edges: list[Edges] = [entity_edges(obstacles) for _, obstacles in games]
+        actual: np.ndarray = kill_mask(BirdSwarm([bird for birds, _ in games for bird in birds]),
+                                       tuple(np.concatenate(edge) for edge in zip(*edges)))
+
+        assert actual.tolist() == expected, f"collision mismatch on trial {trial}"
+
+
+def test_obstacle_pool_matches_entities():
+    # the pool's rects match the entities it stands in for, frame after frame
+    pool: ObstaclePool = ObstaclePool([Course(0)])
+    for frame in range(20_000):
+        pool.update(1 / settings.FRAME_RATE)
+        pool.recycle()
+
+        entities: list[Entity] = [Pipes(pool.pipe_x[0, slot], -pool.top_y[0, slot]) for slot in pool.order[0]]
+        entities += [Base(x) for x in (pool.base_world + pool.ground_scroll[:, np.newaxis])[0].tolist()]
+        assert _rects(pool.edges()) == _rects(entity_edges(entities)), f"obstacle pool mismatch on frame {frame}"
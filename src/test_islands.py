@@ -0,0 +1,60 @@
+import copy
+import random
+from pathlib import Path
+
+import neat
+import neat.config
+import neat.genome
+
+from islands import _IslandReporter, _welcome
+from speciation import VectorSpeciesSet
+
+
+def _config() -> neat.config.Config:
+    return neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction, VectorSpeciesSet, neat.DefaultStagnation,
+                              Path(__file__).parent.resolve() / "neat-config.cfg")
+
+
+def _nodes(population: neat.Population) -> set[int]:
+    return {key for genome in population.population.values() for key in genome.nodes}
+
+
+def _evaluate(genomes: list[tuple[int, neat.genome.DefaultGenome]], _) -> None:
+    for _, genome in genomes:
+        genome.fitness = random.random()
+
+
+def test_migrants_never_share_node_ids_with_their_new_island():
+    config: neat.config.Config = _config()
+
+    for seed in range(5):
+        random.seed(seed)
+
+        # islands emulated in process, each with its own config copy so node numbering is as separate as in
+        # island processes, migrating every generation
+        populations: list[neat.Population] = [neat.Population(copy.deepcopy(config)) for _ in range(3)]
+        reporters: list[_IslandReporter] = []
+        for population in populations:
+            population.config.no_fitness_termination = True
+            reporters.append(_IslandReporter(population.config, 10))
+            population.add_reporter(reporters[-1])
+
+        starts: list[int | None] = [None] * len(populations)
+        for _ in range(60):
+            for index, population in enumerate(populations):
+                known: set[int] = _nodes(population)
+                population.run(_evaluate, 1)
+
+                # nodes added this generation are numbered past every node the island held, migrants included
+                if starts[index] is not None:
+                    assert all(key >= starts[index] for key in _nodes(population) - known)
+
+            tops: list[list[neat.genome.DefaultGenome]] = [copy.deepcopy(reporter.top) for reporter in reporters]
+            for index, population in enumerate(populations):
+                _welcome(population, tops[index - 1])
+
+                keys: list[int] = [genome.key for genome in population.population.values()]
+                assert len(set(keys)) == len(keys)
+
+                starts[index] = next(copy.copy(population.config.genome_config.node_indexer))
+                assert starts[index] > max(_nodes(population))
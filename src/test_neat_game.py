@@ -2,14 +2,21 @@ import settings
 
 from bird import Bird
 from neat_game import NeatGame, NeatBird
+from network import CompiledNetworks
 
 
 class TestNeatGame(NeatGame):
-    def __init__(self, *, headless: bool, bird: NeatBird):
+    # a game replaying the champion, not tests for pytest to collect
+    __test__ = False
+
+    def __init__(self, *, headless: bool, bird: NeatBird, seed: int | None = None,
+                 networks: CompiledNetworks | None = None):
         self._bird: NeatBird = bird
+        # a champion loaded from file thinks through its flattened network
+        self._networks: CompiledNetworks | None = networks
 
         # start normal game operation
-        super(NeatGame, self).__init__(headless=headless)
+        super(NeatGame, self).__init__(headless=headless, seed=seed)
 
     def _gen_birds(self) -> list[Bird]:
         self._bird.x = settings.SCREEN_SIZE.x / 2 - settings.BIRD_SIZE.x / 2
@@ -17,31 +24,27 @@ class TestNeatGame(NeatGame):
 
         return [self._bird]
 
-    def _display_text(self) -> None:
-        self._screen.blit(self._font.render(
-            f"FPS: {round(self._clock.get_fps(), 1)}", True, (255, 255, 255)), (30, 10))
-        self._screen.blit(self._font.render(
-            f"Fit: {self._bird._genome.fitness}", True, (255, 255, 255)), (30, 45))
+    def _display_text(self) -> list[str]:
+        return [f"FPS: {round(self._clock.get_fps(), 1)}", f"Fit: {self.best_fitness}"]
 
     def run(self,) -> None:
         super(NeatGame, self).run()
 
 
 if __name__ == "__main__":
-    import pickle
     from pathlib import Path
 
-    pickle_save_path: Path = Path(
-        __file__).parent.resolve() / "neat_player.pkl"
+    from champion import ChampionBundle
 
-    # Ensure the pickle file exists before running the game
-    try:
-        bird: NeatBird = pickle.load(open(pickle_save_path, 'rb'))
-        bird._genome.fitness = 0
+    champion_save_path: Path = Path(
+        __file__).parent.resolve() / "neat_player.champ"
 
-        with TestNeatGame(headless=False, bird=bird) as game:
-            game.run()
+    # Ensure the champion file exists before running the game
+    try:
+        with ChampionBundle(champion_save_path) as champions:
+            with TestNeatGame(headless=False, bird=champions.bird(), networks=champions.networks) as game:
+                game.run()
 
     except FileNotFoundError:
         raise FileNotFoundError(
-            "neat_game.py must be ran before test_neat_game.py. No previous best NEAT bird pickle file exists yet")
+            "neat_game.py must be ran before test_neat_game.py. No previous best NEAT champion file exists yet")
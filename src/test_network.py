@@ -0,0 +1,50 @@
+import random
+from pathlib import Path
+
+import neat
+import neat.config
+import neat.nn
+import numpy as np
+
+from network import CompiledNetworks, _ACTIVATIONS
+from speciation import VectorSpeciesSet
+
+
+def _genomes(count: int, seed: int) -> tuple[list[neat.genome.DefaultGenome], neat.config.Config]:
+    """Random genomes grown by many mutations, with hidden nodes and every activation the compiler knows"""
+    config: neat.config.Config = neat.config.Config(
+        neat.DefaultGenome, neat.DefaultReproduction, VectorSpeciesSet, neat.DefaultStagnation,
+        Path(__file__).parent.resolve() / "neat-config.cfg")
+    config.pop_size = count
+    config.genome_config.activation_options = list(_ACTIVATIONS)
+    config.genome_config.activation_mutate_rate = 0.3
+
+    random.seed(seed)
+    genomes: list[neat.genome.DefaultGenome] = list(neat.Population(config).population.values())
+    for genome in genomes:
+        for _ in range(30):
+            genome.mutate(config.genome_config)
+
+    return genomes, config
+
+
+def test_compiled_networks_match_feed_forward_networks():
+    genomes, config = _genomes(200, seed=1)
+    networks: CompiledNetworks = CompiledNetworks(genomes, config)
+    inputs: np.ndarray = np.random.default_rng(0).normal(size=(len(genomes), 6)) * 3
+
+    expected: np.ndarray = np.array([
+        neat.nn.FeedForwardNetwork.create(genome, config).activate(tuple(row))
+        for genome, row in zip(genomes, inputs.tolist())])
+
+    assert np.allclose(networks.activate(inputs), expected)
+
+
+def test_activate_frames_matches_activate():
+    genomes, config = _genomes(50, seed=2)
+    networks: CompiledNetworks = CompiledNetworks(genomes, config)
+    inputs: np.ndarray = np.random.default_rng(1).normal(size=(8, len(genomes), 6)) * 3
+
+    frames: np.ndarray = networks.activate_frames(inputs)
+    for frame, row in enumerate(inputs):
+        assert np.array_equal(frames[frame], networks.activate(row))
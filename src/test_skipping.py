@@ -0,0 +1,55 @@
+import random
+from pathlib import Path
+
+import neat
+import neat.config
+import neat.reporting
+
+from neat_game import NeatGame
+from parallel import simulate_shard
+from policy import EvaluationPolicy
+from speciation import VectorSpeciesSet
+
+
+def _config() -> neat.config.Config:
+    return neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction, VectorSpeciesSet, neat.DefaultStagnation,
+                              Path(__file__).parent.resolve() / "neat-config.cfg")
+
+
+class _FitnessLog(neat.reporting.BaseReporter):
+    """Every genome's fitness, generation after generation"""
+
+    def __init__(self):
+        self.generations: list[dict[int, float]] = []
+
+    def post_evaluate(self, config, population, species, best_genome) -> None:
+        self.generations.append({key: genome.fitness for key, genome in population.items()})
+
+
+def _train(*, skip_frames: bool) -> list[dict[int, float]]:
+    random.seed(0)
+    game: NeatGame = NeatGame(headless=True, config=_config(), seed=3, skip_frames=skip_frames,
+                              policy=EvaluationPolicy(max_frames=3_000))
+    log: _FitnessLog = _FitnessLog()
+    game.population.add_reporter(log)
+
+    with game:
+        game.run(generations=5, progress=False)
+
+    return log.generations
+
+
+def test_skipped_frames_train_identically():
+    # any difference in fitness would also change every later generation
+    assert _train(skip_frames=True) == _train(skip_frames=False)
+
+
+def test_skipped_frames_score_identically():
+    config: neat.config.Config = _config()
+    random.seed(1)
+    genomes: list[neat.genome.DefaultGenome] = list(neat.Population(config).population.values())
+
+    for seed in range(5):
+        for policy in (EvaluationPolicy(max_frames=2_000), EvaluationPolicy(max_frames=333)):
+            assert simulate_shard(genomes, config, seed, policy, skip_frames=True) == \
+                simulate_shard(genomes, config, seed, policy)
@@ -0,0 +1,52 @@
+import random
+from pathlib import Path
+
+import neat
+import neat.config
+
+from speciation import VectorSpeciesSet
+
+
+def _config(species_set_type: type) -> neat.config.Config:
+    return neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction, species_set_type, neat.DefaultStagnation,
+                              Path(__file__).parent.resolve() / "neat-config.cfg")
+
+
+def _speciate(species_set_type: type, generations: int) -> list[tuple[dict, dict]]:
+    """Species of every generation of a population evolved on random fitness"""
+    random.seed(7)
+    config: neat.config.Config = _config(species_set_type)
+
+    # mutate structure often so genomes drift apart into several species
+    config.genome_config.conn_add_prob = 0.9
+    config.genome_config.node_add_prob = 0.6
+
+    population: neat.Population = neat.Population(config)
+    generations_seen: list[tuple[dict, dict]] = []
+    for _ in range(generations):
+        for genome in population.population.values():
+            genome.fitness = random.random() * 100
+
+        population.population = population.reproduction.reproduce(
+            config, population.species, config.pop_size, population.generation)
+        population.species.speciate(config, population.population, population.generation)
+        population.generation += 1
+
+        generations_seen.append((
+            dict(population.species.genome_to_species),
+            {key: (species.representative.key, sorted(species.members))
+             for key, species in population.species.species.items()}))
+
+    return generations_seen
+
+
+def test_config_reads_both_species_sets():
+    default: neat.config.Config = _config(neat.DefaultSpeciesSet)
+    vector: neat.config.Config = _config(VectorSpeciesSet)
+
+    assert (default.species_set_config.compatibility_threshold ==
+            vector.species_set_config.compatibility_threshold)
+
+
+def test_vector_species_set_matches_default_species_set():
+    assert _speciate(VectorSpeciesSet, 30) == _speciate(neat.DefaultSpeciesSet, 30)
@@ -30,15 +30,11 @@ class UserGame(Game):
             self._running = False
 
         if keys[pygame.K_SPACE]:
-            for bird in self._birds:
-                # Allows the bird to jump up
-                bird.jump()
-
-    def _display_text(self) -> None:
-        self._screen.blit(self._font.render(
-            f"FPS: {round(self._clock.get_fps(), 1)}", True, (255, 255, 255)), (30, 10))
-        self._screen.blit(self._font.render(
-            f"Birds: {self.birds_alive}", True, (255, 255, 255)), (30, 45))
+            # Allows every bird to jump up
+            self._swarm.jump()
+
+    def _display_text(self) -> list[str]:
+        return [f"FPS: {round(self._clock.get_fps(), 1)}", f"Birds: {self.birds_alive}"]
 
 
 if __name__ == "__main__":
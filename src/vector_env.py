@@ -0,0 +1,145 @@
+import numpy as np
+
+import collision
+import settings
+
+from bird import Bird
+from course import Course
+from obstacles import ObstaclePool
+from sensors import PipeSensor
+from swarm import BirdSwarm
+
+
+class VectorEnv:
+    """Many independent games stepped together from outside code, with reset and step like a vector environment.
+
+    Every game has its own course and birds. Birds of all games live in one BirdSwarm and the pipes and ground
+    of all games in one ObstaclePool, so a step is a handful of array operations whatever the number of games.
+    Frames play out exactly as in Game: an action is what NeatGame decides after observing a frame, and it is
+    applied before the next frame's update.
+    """
+
+    # swarm arrays restored when a game starts over, the birds' sizes never change
+    _BIRD_STATE: tuple[str, ...] = ("x", "y", "vx", "vy", "rotation", "frame_counter", "jump_counter", "alive")
+
+    def __init__(self, envs: int, birds: int = 1, *, seed: int | None = None, max_frames: int | None = None,
+                 timestep: float = 1 / settings.FRAME_RATE):
+        if envs <= 0 or birds <= 0:
+            raise ValueError("A vector environment needs at least one game and one bird per game")
+        if max_frames is not None and max_frames <= 0:
+            raise ValueError("Max frames must be a positive number")
+        if timestep <= 0:
+            raise ValueError("Timestep must be a positive number")
+
+        self._envs: int = envs
+        self._birds: int = birds
+        self._max_frames: int | None = max_frames
+        self._dt: float = timestep
+
+        # birds start where NeatGame puts them, every bird of every game in one swarm, a game's birds side by side
+        self._swarm: BirdSwarm = BirdSwarm([
+            Bird(settings.SCREEN_SIZE.x / 2 - settings.BIRD_SIZE.x / 2, settings.SCREEN_SIZE.y / 2)
+            for _ in range(envs * birds)])
+        self._start: dict[str, np.ndarray] = {
+            name: getattr(self._swarm, name)[:birds].copy() for name in self._BIRD_STATE}
+
+        # a seed numbers the courses of every episode played from it, otherwise each episode draws its own
+        self._next_seed: int | None = seed
+        self._obstacles: ObstaclePool = ObstaclePool([Course(0)] * envs)
+        self._sensor: PipeSensor = PipeSensor(envs * birds)
+        self._frames: np.ndarray = np.zeros(envs, np.intp)
+
+        self._rows: np.ndarray = np.arange(envs)
+        self._started: bool = False
+
+    @property
+    def envs(self) -> int:
+        return self._envs
+
+    @property
+    def birds(self) -> int:
+        return self._birds
+
+    @property
+    def courses(self) -> list[Course]:
+        """Course every game is playing"""
+        return self._obstacles.courses
+
+    @property
+    def frames(self) -> np.ndarray:
+        """Frames every game has played in its current episode"""
+        return self._frames
+
+    @property
+    def alive(self) -> np.ndarray:
+        """Which birds are still flying, shaped (envs, birds)"""
+        return self._swarm.alive.reshape(self._envs, self._birds)
+
+    def __next_course(self) -> Course:
+        if self._next_seed is None:
+            return Course()
+
+        course: Course = Course(self._next_seed)
+        self._next_seed += 1
+        return course
+
+    def __restart(self, envs: np.ndarray) -> None:
+        """Starts a new episode of each game in envs on a course of its own"""
+        birds: int = self._birds
+        for name in self._BIRD_STATE:
+            getattr(self._swarm, name).reshape(self._envs, birds)[envs] = self._start[name]
+
+        self._frames[envs] = 0
+        self._obstacles.restart(envs, [self.__next_course() for _ in range(len(envs))])
+
+    def reset(self, seed: int | None = None) -> np.ndarray:
+        """Starts every game over and returns the first observations, shaped (envs, birds, INPUTS).
+
+        With a seed, game i plays the course seeded seed + i, and the games that start over after it take
+        the following seeds in turn.
+        """
+        if seed is not None:
+            self._next_seed = seed
+
+        self.__restart(self._rows)
+        self._started = True
+
+        return self.__observe()
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Plays one frame of every game, returns the observations, rewards and which games are done.
+
+        actions says which birds jump, shaped (envs, birds) or (envs,) with one bird per game. Dead birds and
+        birds still within their jump delay ignore it, as in Game. Every bird alive at the end of the frame
+        is rewarded 1, and a game is done once all its birds are dead or max_frames is reached. Games that
+        are done start over straight away, so their observations are the first of their next episode.
+        """
+        if not self._started:
+            raise RuntimeError("reset must be called before step")
+
+        swarm: BirdSwarm = self._swarm
+        swarm.jump(np.asarray(actions, np.bool_).reshape(-1))
+
+        # Game._update, Game._recycle_pipes and Game._collide for every game at once
+        self._obstacles.update(self._dt)
+        swarm.update(self._dt)
+        self._obstacles.recycle()
+        swarm.kill(collision.kill_mask(swarm, self._obstacles.edges()))
+        self._frames += 1
+
+        alive: np.ndarray = self.alive
+        rewards: np.ndarray = alive.astype(np.float64)
+        dones: np.ndarray = ~alive.any(axis=1)
+        if self._max_frames is not None:
+            dones |= self._frames >= self._max_frames
+
+        if dones.any():
+            self.__restart(np.flatnonzero(dones))
+
+        return self.__observe(), rewards, dones
+
+    def __observe(self) -> np.ndarray:
+        """PipeSensor.observe for every game, shaped (envs, birds, INPUTS)"""
+        # the sensor reuses its buffer, callers may keep observations across steps
+        return self._sensor.observe(self._swarm, self._obstacles).reshape(
+            self._envs, self._birds, PipeSensor.INPUTS).copy()